@@ -1,111 +1,16 @@
-import hashlib
-import time
-import random
+import sys
 import tkinter as tk
 from tkinter import ttk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import threading
-import psutil
-
-def hash256(s):
-    """Two rounds of SHA256"""
-    return hashlib.sha256(hashlib.sha256(s).digest()).digest()
-
-def create_transaction_of_size(byte_size):
-    """Simulates a transaction with a predefined size in bytes."""
-    return ''.join(random.choices('01', k=byte_size * 8))  # Simulate byte_size in bits as a binary string.
-
-class Block:
-    def __init__(self, Height, Blocksize, BlockHeader, TxCount, Txs):
-        self.Height = Height
-        self.Blocksize = Blocksize
-        self.BlockHeader = BlockHeader
-        self.Txcount = TxCount
-        self.Txs = Txs
-
-class BlockHeader:
-    def __init__(self, version, prevBlockHash, merkleRoot, timestamp, bits):
-        self.version = version
-        self.prevBlockHash = prevBlockHash
-        self.merkleRoot = merkleRoot
-        self.timestamp = timestamp
-        self.bits = bits
-        self.nonce = 0
-        self.blockHash = self.generate_block_hash()  # Generate hash immediately
-
-    def generate_block_hash(self):
-        """Simulate instant block hash generation for PoA"""
-        return hash256((str(self.version) + self.prevBlockHash + self.merkleRoot + str(self.timestamp)
-                        + self.bits).encode()).hex()
-
-class Blockchain:
-    def __init__(self, validation_delay=0):
-        self.blockchain = []
-        self.block_times = []
-        self.validation_delay = validation_delay  # Delay in seconds
-
-    def set_validation_delay(self, delay):
-        """Allows setting the validation delay dynamically."""
-        self.validation_delay = delay
-
-    def create_genesis_block(self):
-        BlockHeight = 0
-        prevBlockHash = '0' * 64
-        self.addBlock(BlockHeight, prevBlockHash, 1)
-
-    def addBlock(self, BlockHeight, prevBlockHash, transaction_size):
-        start_time = time.time()
-        
-        # Apply validation delay before adding the block (for simulating network delay if needed)
-        time.sleep(self.validation_delay)
-        
-        timestamp = int(time.time())
-        transactions = [create_transaction_of_size(transaction_size) for _ in range(transaction_size)]
-        merkleRoot = self.create_merkle_root(transactions)
-        bits = 'ffff001f'
-        blockheader = BlockHeader(1, prevBlockHash, merkleRoot, timestamp, bits)  # Hash generated instantly
-        
-        new_block = Block(BlockHeight, 1, blockheader.__dict__, len(transactions), transactions).__dict__
-        self.blockchain.append(new_block)
-        
-        end_time = time.time()
-        block_creation_time = end_time - start_time
-        self.block_times.append(block_creation_time)
-        
-        print(f"Block {BlockHeight} added in {block_creation_time:.5f} seconds with {len(transactions)} transactions")
-        return block_creation_time
-
-    def create_merkle_root(self, transactions):
-        """Creates a Merkle root from a list of transactions."""
-        transaction_hashes = [hash256(tx.encode()).hex() for tx in transactions]
-        while len(transaction_hashes) > 1:
-            if len(transaction_hashes) % 2 != 0:
-                transaction_hashes.append(transaction_hashes[-1])
-            transaction_hashes = [hash256((transaction_hashes[i] + transaction_hashes[i + 1]).encode()).hex()
-                                  for i in range(0, len(transaction_hashes), 2)]
-        return transaction_hashes[0]
-
-    def get_last_block(self):
-        return self.blockchain[-1] if self.blockchain else None
-
-    def print_statistics(self):
-        if self.block_times:
-            average_time = sum(self.block_times) / len(self.block_times)
-            print(f"Average block creation time: {average_time:.5f} seconds")
-            print(f"CPU Usage: {psutil.cpu_percent()}%")
-            print(f"Memory Usage: {psutil.virtual_memory().percent}%")
-
-    def visualize_blockchain(self, ax):
-        heights = [block["Height"] for block in self.blockchain]
-        creation_times = self.block_times
-
-        ax.clear()
-        ax.plot(heights, creation_times, marker='o', linestyle='-', color='b')
-        ax.set_xlabel('Block Height')
-        ax.set_ylabel('Creation Time (s)')
-        ax.set_title('Blockchain Block Creation Time per Block')
-        ax.grid(True)
+import time
+from chainstore import BlockFileStore, ChainStore
+from gui_render import BoundedTable, FrameRenderer, IncrementalPlot
+from merkle import hash256
+from poa_chain import Blockchain
+from simclock import RealClock, VirtualClock
+from txstore import TxBodyStore
 
 class BlockchainApp(tk.Tk):
     def __init__(self, blockchain):
@@ -120,8 +25,15 @@ class BlockchainApp(tk.Tk):
 
         self.create_widgets()
 
+        # Worker threads only post events; the Tk main loop redraws at a fixed frame rate
+        self.renderer = FrameRenderer(self, fps=10)
+        self.renderer.on_frame(self.table.flush)
+        self.renderer.on_frame(self.plot.flush)
+        self.renderer.on_frame(self.update_performance_metrics)
+        self.renderer.start()
+
     def create_widgets(self):
-        self.add_transaction_button = ttk.Button(self, text="Add Transaction", command=self.add_transaction)
+        self.add_transaction_button = ttk.Button(self, text="Add Transaction", command=lambda: self.add_transaction(*self.block_parameters()))
         self.add_transaction_button.pack()
 
         # Input for validation delay
@@ -140,6 +52,11 @@ class BlockchainApp(tk.Tk):
         self.num_blocks_entry.pack()
         self.num_blocks_entry.insert(0, "10")  # Default to 10 blocks
 
+        # Virtual time skips validation delays instead of sleeping through them
+        self.virtual_time = tk.BooleanVar(value=False)
+        self.virtual_time_check = ttk.Checkbutton(self, text="Virtual Time", variable=self.virtual_time)
+        self.virtual_time_check.pack()
+
         self.start_mining_button = ttk.Button(self, text="Start Adding Blocks", command=self.start_mining)
         self.start_mining_button.pack()
 
@@ -155,6 +72,7 @@ class BlockchainApp(tk.Tk):
         self.tree.pack(fill=tk.BOTH, expand=True)
 
         self.tree.bind('<Double-1>', self.show_block_details)
+        self.table = BoundedTable(self.tree, max_rows=500)
 
         self.tps_label = ttk.Label(self, text="TPS: 0.0")
         self.tps_label.pack()
@@ -162,15 +80,35 @@ class BlockchainApp(tk.Tk):
         self.avg_creation_time_label = ttk.Label(self, text="Avg Creation Time: 0.00 ms")
         self.avg_creation_time_label.pack()
 
+        self.rolling_label = ttk.Label(self, text="Last 10 s: 0.0 TPS, 0.0 blocks/s")
+        self.rolling_label.pack()
+
+        self.percentile_label = ttk.Label(self, text="Creation Time p50/p95/p99: 0.00 / 0.00 / 0.00 ms")
+        self.percentile_label.pack()
+
         self.num_transactions_label = ttk.Label(self, text="Transaction Size (in Bytes):")
         self.num_transactions_label.pack()
         self.num_transactions_entry = ttk.Entry(self)
         self.num_transactions_entry.pack()
         self.num_transactions_entry.insert(0, "100")  # Default byte size
 
+        self.tx_count_label = ttk.Label(self, text="Transactions per Block:")
+        self.tx_count_label.pack()
+        self.tx_count_entry = ttk.Entry(self)
+        self.tx_count_entry.pack()
+        self.tx_count_entry.insert(0, "100")
+
         self.fig, self.ax = plt.subplots(figsize=(8, 4))
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
         self.canvas.get_tk_widget().pack()
+        self.plot = IncrementalPlot(self.ax, self.canvas, 'Block Height', 'Creation Time (s)',
+                                    'Blockchain Block Creation Time per Block',
+                                    marker='o', linestyle='-', color='b')
+        self.ax.grid(True)
+        # Blocks created before the app started (e.g. genesis) are plotted as well
+        first_height = len(self.blockchain.blockchain) - len(self.blockchain.block_times)
+        for offset, creation_time in enumerate(self.blockchain.block_times):
+            self.plot.append(first_height + offset, creation_time)
 
     def set_delay(self):
         """Sets the validation delay in the blockchain instance."""
@@ -181,36 +119,55 @@ class BlockchainApp(tk.Tk):
         except ValueError:
             print("Invalid delay value")
 
-    def add_transaction(self):
+    def block_parameters(self):
+        """Reads transaction size and count from the entries; call on the Tk main loop only."""
         transaction_size = int(self.num_transactions_entry.get()) if self.num_transactions_entry.get() else 100
+        tx_count = int(self.tx_count_entry.get()) if self.tx_count_entry.get() else 100
+        return transaction_size, tx_count
+
+    def add_transaction(self, transaction_size, tx_count):
         lastBlock = self.blockchain.get_last_block()
         BlockHeight = lastBlock["Height"] + 1 if lastBlock else 0
         prevBlockHash = lastBlock['BlockHeader']['blockHash'] if lastBlock else '0' * 64
 
-        creation_time = self.blockchain.addBlock(BlockHeight, prevBlockHash, transaction_size)
-        tps = transaction_size / creation_time if creation_time > 0 else 0
-
-        # Insert row into the treeview table
-        self.tree.insert('', 'end', values=(BlockHeight, f"{creation_time:.5f}", f"{tps:.2f}"))
+        creation_time = self.blockchain.addBlock(BlockHeight, prevBlockHash, transaction_size, tx_count)
+        tps = tx_count / creation_time if creation_time > 0 else 0
 
-        self.update_performance_metrics()
-        self.visualize_blockchain()
+        self.renderer.post(self.block_added, BlockHeight, creation_time, tps)
 
         self.blocks_mined += 1
         if self.blocks_mined >= self.blocks_to_mine:
             self.stop_mining_process()
 
+    def block_added(self, BlockHeight, creation_time, tps):
+        # Insert row into the treeview table
+        self.table.append((BlockHeight, f"{creation_time:.5f}", f"{tps:.2f}"))
+        self.plot.append(BlockHeight, creation_time)
+
+    def mining_clock(self):
+        """Keeps a running virtual clock across starts; a new one starts at the chain tip's timestamp."""
+        if not self.virtual_time.get():
+            return RealClock()
+        if isinstance(self.blockchain.clock, VirtualClock):
+            return self.blockchain.clock
+        lastBlock = self.blockchain.get_last_block()
+        start = max(time.time(), lastBlock['BlockHeader']['timestamp']) if lastBlock else None
+        return VirtualClock(start=start, cpu_time=True)
+
     def start_mining(self):
+        self.blockchain.clock = self.mining_clock()
         self.stop_mining = False
         self.blocks_mined = 0
         self.blocks_to_mine = int(self.num_blocks_entry.get())  
-        mining_thread = threading.Thread(target=self.mine_blocks_continuously)
+        # Read the entries here on the main loop; the mining thread never touches Tk
+        transaction_size, tx_count = self.block_parameters()
+        mining_thread = threading.Thread(target=self.mine_blocks_continuously, args=(transaction_size, tx_count))
         mining_thread.start()
 
-    def mine_blocks_continuously(self):
+    def mine_blocks_continuously(self, transaction_size, tx_count):
         while not self.stop_mining and self.blocks_mined < self.blocks_to_mine:
-            self.add_transaction()
-            time.sleep(0.1)
+            self.add_transaction(transaction_size, tx_count)
+            self.blockchain.clock.sleep(0.1)
 
     def stop_mining_process(self):
         self.stop_mining = True
@@ -219,38 +176,44 @@ class BlockchainApp(tk.Tk):
         item = self.tree.selection()[0]
         block_height = self.tree.item(item, 'values')[0]
         
-        for block in self.blockchain.blockchain:
-            if block["Height"] == int(block_height):
-                detail_window = tk.Toplevel(self)
-                detail_window.title(f"Block {block_height} Details")
+        block = self.blockchain.get_block(int(block_height))
+        if block is not None:
+            detail_window = tk.Toplevel(self)
+            detail_window.title(f"Block {block_height} Details")
 
-                tx_label = ttk.Label(detail_window, text=f"Transactions in Block {block_height}:")
-                tx_label.pack()
+            tx_label = ttk.Label(detail_window, text=f"Transactions in Block {block_height}:")
+            tx_label.pack()
 
-                for tx in block["Txs"]:
-                    tx_info = ttk.Label(detail_window, text=tx)
-                    tx_info.pack()
+            # Bodies are rebuilt on demand; pruned blocks only have their transaction hashes left
+            txs = block["Txs"]
+            for tx in txs if txs is not None else block["TxIds"]:
+                tx_info = ttk.Label(detail_window, text=tx.hex())
+                tx_info.pack()
 
     def update_performance_metrics(self):
-        if self.blockchain.block_times:
-            total_transactions = sum(block["Txcount"] for block in self.blockchain.blockchain)
-            total_time = sum(self.blockchain.block_times)
-            average_time = total_time / len(self.blockchain.block_times) if len(self.blockchain.block_times) > 0 else 0
-
-            self.avg_creation_time_label.config(text=f"Avg Creation Time: {average_time:.5f} ms")
-            
-            if total_time > 0:
-                self.tps_label.config(text=f"TPS: {total_transactions / total_time:.2f}")
+        # Running totals and sketches in blockchain.metrics, so each frame costs the same at any chain length
+        metrics = self.blockchain.metrics
+        if metrics.blocks:
+            self.avg_creation_time_label.config(text=f"Avg Creation Time: {metrics.mean_block_time() * 1000:.2f} ms")
+
+            if metrics.block_time_total > 0:
+                self.tps_label.config(text=f"TPS: {metrics.tps():.2f}")
             else:
                 self.tps_label.config(text="TPS: N/A")
 
-    def visualize_blockchain(self):
-        self.blockchain.visualize_blockchain(self.ax)
-        self.canvas.draw()
+            self.rolling_label.config(text=f"Last {metrics.window:.0f} s: {metrics.rolling_tps():.1f} TPS, "
+                                           f"{metrics.rolling_block_rate():.1f} blocks/s")
+            self.percentile_label.config(
+                text=f"Creation Time p50/p95/p99: {metrics.quantile(0.5) * 1000:.2f} / "
+                     f"{metrics.quantile(0.95) * 1000:.2f} / {metrics.quantile(0.99) * 1000:.2f} ms")
 
 
 if __name__ == "__main__":
-    blockchain = Blockchain()
-    blockchain.create_genesis_block()
+    # Optional chain file: python PoA.py chain.dat resumes from the last stored block.
+    # In memory, blocks keep only transaction hashes and a seed; bodies are rebuilt when shown.
+    store = BlockFileStore(sys.argv[1]) if len(sys.argv) > 1 else ChainStore(TxBodyStore(hash256))
+    blockchain = Blockchain(store=store)
+    if not blockchain.blockchain:
+        blockchain.create_genesis_block()
     app = BlockchainApp(blockchain)
     app.mainloop()
@@ -0,0 +1,288 @@
+"""Headless benchmark runner for the PoW, PoA and multichain simulations.
+
+Runs the chain classes without tkinter or matplotlib and prints the
+results as JSON, e.g.
+
+    python benchmark.py --sim all --blocks 50 --difficulty 3 --tx-size 100
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import json
+import math
+import os
+import random
+import sys
+import time
+
+import multichain
+import poa_chain
+import pow_chain
+from chainstore import ChainStore
+from mempool import stream_blocks
+from merkle import MerkleTree, hash256, sha256, verify_proof
+from retarget import RETARGETERS
+from simclock import BlockProducer, RealClock, Simulator, VirtualClock
+from tracing import NULL_TRACER, Tracer
+from txstore import TxBodyStore
+
+SIMULATIONS = ('pow', 'poa', 'multichain')
+# Hashfunktion der Merkle-Blätter je Simulation, für Inclusion Proofs
+LEAF_HASHES = {'poa': hash256, 'multichain': sha256}
+
+merkle_executors = {}  # --merkle-threads -> gemeinsamer Thread-Pool aller Trials
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+def make_clock(args):
+    return VirtualClock(cpu_time=True) if args.virtual_time else RealClock()
+
+def setup_pow(args):
+    """Returns a fresh PoW chain with its genesis block."""
+    blockchain = pow_chain.Blockchain(difficulty=args.difficulty, workers=args.workers)
+    if args.target_block_time > 0:
+        blockchain.set_retarget(RETARGETERS[args.retarget](args.target_block_time, args.retarget_window))
+    blockchain.create_genesis_block(block_size=args.block_size)
+    return blockchain
+
+def make_merkle_executor(args):
+    """Returns a shared thread pool for Merkle leaf hashing with --merkle-threads, else None."""
+    if not args.merkle_threads:
+        return None
+    if args.merkle_threads not in merkle_executors:
+        merkle_executors[args.merkle_threads] = concurrent.futures.ThreadPoolExecutor(args.merkle_threads)
+    return merkle_executors[args.merkle_threads]
+
+def make_store(args, hash_function):
+    """Returns a ChainStore that keeps only tx hashes and seeds with --lazy-txs, else None (full bodies)."""
+    if not args.lazy_txs:
+        return None
+    return ChainStore(TxBodyStore(hash_function, args.tx_cache_blocks, args.prune_depth))
+
+def setup_poa(args):
+    """Returns a fresh PoA chain with its genesis block."""
+    blockchain = poa_chain.Blockchain(validation_delay=args.validation_delay, clock=make_clock(args),
+                                      store=make_store(args, hash256), merkle_executor=make_merkle_executor(args))
+    blockchain.create_genesis_block()
+    return blockchain
+
+def setup_multichain(args):
+    """Returns a fresh multichain Chain; its constructor adds the genesis block."""
+    return multichain.Chain("Chain", 1, validation_delay=args.validation_delay, clock=make_clock(args),
+                            store=make_store(args, sha256), merkle_executor=make_merkle_executor(args))
+
+def produce_pow(blockchain, args):
+    """Mines args.blocks PoW blocks and returns (block_times, tx_count, hashes, details)."""
+    block_times = []
+    # Tatsächlich berechnete Hashes aus der Telemetrie, inklusive Überhang der parallelen Worker
+    hashes_before = blockchain.telemetry.total_hashes
+    for _ in range(args.blocks):
+        prev_hash = blockchain.chain[-1].header.block_hash
+        block_times.append(blockchain.add_block(prev_hash, args.block_size))
+    return block_times, 0, blockchain.telemetry.total_hashes - hashes_before, {}
+
+def produce_poa(chain, args):
+    """Adds args.blocks PoA blocks and returns (block_times, tx_count, hashes, details)."""
+    if args.virtual_time:
+        # Verzögerungen als Ereignisse in virtueller Zeit statt als echte Sleeps
+        simulator = Simulator(chain.clock)
+        block_times = []
+        producer = BlockProducer(simulator, chain, args.blocks, args.tx_size, args.tx_count or args.tx_size,
+                                 args.block_interval, args.network_delay,
+                                 on_block=lambda height, creation_time: block_times.append(creation_time))
+        producer.start()
+        simulator.run()
+        return block_times, len(block_times) * (args.tx_count or args.tx_size), args.blocks, {}
+    if args.producers:
+        # Transaktionen kommen kontinuierlich aus dem Mempool statt inline aus addBlock
+        # Mit --max-block-bytes begrenzt nur das Byte-Budget, solange --tx-count nicht gesetzt ist
+        max_count = args.tx_count or (None if args.max_block_bytes else args.tx_size)
+        result = stream_blocks(chain, args.blocks, args.tx_size, max_count=max_count,
+                               max_bytes=args.max_block_bytes, producers=args.producers)
+        return result['block_times'], result['transactions'], args.blocks, {'mempool': result['mempool']}
+    block_times = []
+    tx_count = 0
+    for _ in range(args.blocks):
+        lastBlock = chain.get_last_block()
+        BlockHeight = lastBlock["Height"] + 1 if lastBlock else 0
+        prevBlockHash = lastBlock['BlockHeader']['blockHash'] if lastBlock else '0' * 64
+        block_times.append(chain.addBlock(BlockHeight, prevBlockHash, args.tx_size, args.tx_count))
+        tx_count += chain.get_last_block()["Txcount"]
+    # PoA erzeugt genau einen Header-Hash pro Block
+    return block_times, tx_count, args.blocks, {}
+
+def measure_proofs(chain, hash_function, count, seed=0):
+    """Builds and verifies count inclusion proofs for random transactions, as a light client would.
+
+    Proof building needs the block's Merkle tree; verification only needs
+    the leaf hash, the proof and the header's Merkle root.
+    """
+    if count <= 0 or len(chain.blockchain) < 2:
+        return {}
+    rng = random.Random(seed)
+    heights = [rng.randrange(1, len(chain.blockchain)) for _ in range(count)]
+    trees = {}
+    proofs = []
+    start = time.perf_counter()
+    for height in heights:
+        if height not in trees:
+            block = chain.get_block(height)
+            txs = block['Txs']
+            trees[height] = (MerkleTree(txs, hash_function) if txs is not None
+                             else MerkleTree.from_leaves(block['TxIds'], hash_function))
+        tree = trees[height]
+        index = rng.randrange(len(tree))
+        proofs.append((tree.levels[0][index], tree.proof(index), tree.root))
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    verified = sum(verify_proof(leaf, proof, root, hash_function) for leaf, proof, root in proofs)
+    verify_elapsed = time.perf_counter() - start
+    return {
+        'proofs_valid': verified == count,
+        'proof_build_per_s': count / built if built > 0 else 0.0,
+        'proof_verify_per_s': count / verify_elapsed if verify_elapsed > 0 else 0.0,
+        'proof_bytes': sum(len(proof) for _, proof, _ in proofs) * 32 / count,
+    }
+
+RUNNERS = {
+    'pow': (setup_pow, produce_pow),
+    'poa': (setup_poa, produce_poa),
+    'multichain': (setup_multichain, produce_poa),
+}
+
+def run_trial(sim, args, tracer=NULL_TRACER):
+    """Runs one trial on a fresh chain; genesis setup and console output are excluded."""
+    setup, produce = RUNNERS[sim]
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        chain = setup(args)
+        chain.tracer = tracer
+        virtual = args.virtual_time and sim != 'pow'
+        sim_start = chain.clock.time() if virtual else None
+        start = time.perf_counter()
+        with tracer:
+            block_times, tx_count, hashes, details = produce(chain, args)
+        elapsed = time.perf_counter() - start
+    # Mit --virtual-time zählen Blöcke und Transaktionen pro simulierter Sekunde, sonst pro Wanduhr-Sekunde
+    rate_elapsed = chain.clock.time() - sim_start if virtual else elapsed
+    trial = {
+        'elapsed_s': elapsed,
+        'blocks_per_s': args.blocks / rate_elapsed if rate_elapsed > 0 else 0.0,
+        'tx_per_s': tx_count / rate_elapsed if rate_elapsed > 0 else 0.0,
+        'hashes_per_s': hashes / elapsed if elapsed > 0 else 0.0,
+        'block_times': block_times,
+        **details,
+    }
+    if virtual:
+        trial['sim_elapsed_s'] = rate_elapsed
+    if args.validate:
+        # Validierung getrennt von der Blockproduktion messen
+        validation = chain.validate_chain(workers=args.validation_workers or None)
+        trial['validation_valid'] = validation['valid']
+        trial['validation_blocks_per_s'] = validation['blocks_per_s']
+    if args.proofs and sim in LEAF_HASHES:
+        trial.update(measure_proofs(chain, LEAF_HASHES[sim], args.proofs))
+    if sim == 'pow':
+        chain.close()  # Mining-Prozesse dieses Trials beenden
+    return trial
+
+def trace_path(path, sim, selected):
+    """With --sim all every simulation gets its own trace file, e.g. trace.poa.json."""
+    if selected != 'all':
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{sim}{ext}"
+
+def benchmark(sim, args):
+    """Runs warm-up and measured trials and aggregates them into one result dict."""
+    for _ in range(args.warmup):
+        run_trial(sim, args)
+    # Phasen nur in den gemessenen Durchläufen aufzeichnen
+    tracer = Tracer(profile=args.profile, trace_memory=args.trace_memory)
+    trials = [run_trial(sim, args, tracer) for _ in range(args.trials)]
+    if args.trace:
+        tracer.write(trace_path(args.trace, sim, args.sim), args.trace_format)
+    block_times = [t for trial in trials for t in trial['block_times']]
+    total_elapsed = sum(trial['elapsed_s'] for trial in trials)
+    # Raten über dieselbe Zeitbasis mitteln, mit der sie berechnet wurden (simuliert oder Wanduhr)
+    rate_elapsed = [trial.get('sim_elapsed_s', trial['elapsed_s']) for trial in trials]
+    validation_rates = [trial['validation_blocks_per_s'] for trial in trials if 'validation_blocks_per_s' in trial]
+    result = {
+        'blocks_per_s': sum(trial['blocks_per_s'] * t for trial, t in zip(trials, rate_elapsed)) / sum(rate_elapsed),
+        'tx_per_s': sum(trial['tx_per_s'] * t for trial, t in zip(trials, rate_elapsed)) / sum(rate_elapsed),
+        'hashes_per_s': sum(trial['hashes_per_s'] * trial['elapsed_s'] for trial in trials) / total_elapsed,
+        'block_time_p50': percentile(block_times, 0.50),
+        'block_time_p95': percentile(block_times, 0.95),
+        'block_time_p99': percentile(block_times, 0.99),
+        'validation_blocks_per_s': sum(validation_rates) / len(validation_rates) if validation_rates else None,
+        'trials': [{key: value for key, value in trial.items() if key != 'block_times'} for trial in trials],
+        'phases': tracer.summary(),
+    }
+    if args.profile:
+        result['profile'] = tracer.profile_stats()
+    if args.trace_memory:
+        result['memory_top'] = tracer.memory_stats()
+    return result
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sim', choices=SIMULATIONS + ('all',), default='all')
+    parser.add_argument('--blocks', type=int, default=20, help='blocks per trial')
+    parser.add_argument('--difficulty', type=float, default=2, help='PoW difficulty in leading hex zeros')
+    parser.add_argument('--workers', type=int, default=1, help='PoW mining processes (0 = all cores)')
+    parser.add_argument('--block-size', type=int, default=1024, help='PoW block size in bytes')
+    parser.add_argument('--target-block-time', type=float, default=0.0,
+                        help='retarget PoW difficulty towards this block time in seconds (0 = fixed difficulty)')
+    parser.add_argument('--retarget', choices=sorted(RETARGETERS), default='lwma', help='PoW retargeting rule')
+    parser.add_argument('--retarget-window', type=int, default=45, help='PoW retarget window in blocks')
+    parser.add_argument('--tx-size', type=int, default=100, help='PoA transaction size in bytes')
+    parser.add_argument('--tx-count', type=int, help='PoA transactions per block (default: same as --tx-size)')
+    parser.add_argument('--producers', type=int, default=0,
+                        help='stream PoA transactions from this many mempool producer threads (0 = inline)')
+    parser.add_argument('--max-block-bytes', type=int,
+                        help='with --producers, fill blocks up to this many transaction bytes')
+    parser.add_argument('--validation-delay', type=float, default=0.0, help='PoA validation delay in seconds')
+    parser.add_argument('--lazy-txs', action='store_true',
+                        help='PoA blocks keep tx hashes and a seed; bodies are rebuilt on demand')
+    parser.add_argument('--tx-cache-blocks', type=int, default=64, help='blocks of rebuilt bodies to cache')
+    parser.add_argument('--prune-depth', type=int, help='drop non-rebuildable bodies this many blocks deep')
+    parser.add_argument('--merkle-threads', type=int, default=0,
+                        help='hash PoA Merkle leaves of >= 2 KiB transactions on this many threads (0 = inline)')
+    parser.add_argument('--proofs', type=int, default=0,
+                        help='build and verify this many PoA Merkle inclusion proofs after each trial')
+    parser.add_argument('--validate', action='store_true', help='validate each chain after production')
+    parser.add_argument('--validation-workers', type=int, default=0, help='validation processes (0 = all cores)')
+    parser.add_argument('--virtual-time', action='store_true',
+                        help='run PoA delays as discrete events on a virtual clock instead of sleeping')
+    parser.add_argument('--network-delay', type=float, default=0.0, help='PoA network delay in virtual seconds')
+    parser.add_argument('--block-interval', type=float, default=0.0, help='PoA block interval in virtual seconds')
+    parser.add_argument('--warmup', type=int, default=1, help='discarded warm-up trials')
+    parser.add_argument('--trials', type=int, default=3, help='measured trials')
+    parser.add_argument('--output', help='write JSON to this file instead of stdout')
+    parser.add_argument('--trace', help='write the per-phase spans of the measured trials to this file')
+    parser.add_argument('--trace-format', choices=('json', 'chrome'), default='chrome',
+                        help='span file format (chrome = chrome://tracing / Perfetto)')
+    parser.add_argument('--profile', action='store_true', help='run cProfile over the measured trials')
+    parser.add_argument('--trace-memory', action='store_true', help='run tracemalloc over the measured trials')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.workers = args.workers or None
+    sims = SIMULATIONS if args.sim == 'all' else (args.sim,)
+    config = {key: value for key, value in vars(args).items() if key != 'output'}
+    report = {'config': config, 'results': {sim: benchmark(sim, args) for sim in sims}}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == '__main__':
+    sys.exit(main())
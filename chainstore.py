@@ -0,0 +1,288 @@
+import array
+import mmap
+import os
+import struct
+import threading
+
+# Height, Blocksize, Txcount | version, prevBlockHash, merkleRoot, timestamp, bits, nonce, blockHash
+RECORD = struct.Struct('<QII I32s32sq4sI32s')
+HEADER_FIELDS = ('version', 'prevBlockHash', 'merkleRoot', 'timestamp', 'bits', 'nonce', 'blockHash')
+HEX_FIELDS = frozenset(('prevBlockHash', 'merkleRoot', 'bits', 'blockHash'))
+BLOCK_FIELDS = ('Height', 'Blocksize', 'BlockHeader', 'Txcount', 'Txs')
+
+class HeaderView:
+    """Read-only view of one packed header; fields read like the old header dicts."""
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, key):
+        try:
+            position = HEADER_FIELDS.index(key)
+        except ValueError:
+            raise KeyError(key) from None
+        value = self.store.unpack(self.index)[3 + position]
+        return value.hex() if key in HEX_FIELDS else value
+
+    def keys(self):
+        return HEADER_FIELDS
+
+    def to_dict(self):
+        return {key: self[key] for key in HEADER_FIELDS}
+
+class BlockView:
+    """Read-only view of one stored block; fields read like the old block dicts."""
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, key):
+        if key == 'BlockHeader':
+            return HeaderView(self.store, self.index)
+        if key == 'Txs':
+            return self.store.load_txs(self.index)
+        if key == 'TxIds':
+            return self.store.load_txids(self.index)
+        try:
+            position = ('Height', 'Blocksize', 'Txcount').index(key)
+        except ValueError:
+            raise KeyError(key) from None
+        return self.store.unpack(self.index)[position]
+
+    def keys(self):
+        return BLOCK_FIELDS
+
+    def to_dict(self):
+        block = {key: self[key] for key in BLOCK_FIELDS}
+        block['BlockHeader'] = block['BlockHeader'].to_dict()
+        return block
+
+class ChainStore:
+    """Append-only block list that packs each header into a fixed 132-byte record.
+
+    Records live in one contiguous bytearray indexed by position (= height for
+    chains that start at genesis), which avoids a dict per block and per header.
+    With a txstore.TxBodyStore only transaction hashes (plus a seed to rebuild
+    generated bodies) are kept per block instead of the transaction lists.
+    """
+    tx_store = None
+
+    def __init__(self, tx_store=None):
+        self.records = bytearray()
+        self.txs = []
+        self.positions = {}  # blockHash (bytes) -> position
+        self.tx_store = tx_store
+
+    def __len__(self):
+        return len(self.txs)
+
+    def __bool__(self):
+        return bool(self.txs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [BlockView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('block index out of range')
+        return BlockView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield BlockView(self, index)
+
+    def unpack(self, index):
+        return RECORD.unpack_from(self.records, index * RECORD.size)
+
+    def load_txs(self, index):
+        if self.tx_store is None:
+            return self.txs[index]
+        return self.tx_store.load(self.txs, index)
+
+    def load_txids(self, index):
+        """Returns the stored leaf hashes of block index, or None if the store keeps full bodies."""
+        if self.tx_store is None:
+            return None
+        return self.tx_store.load_txids(self.txs, index)
+
+    def hash_index(self):
+        return self.positions
+
+    def find(self, block_hash):
+        """Returns the block with the given hex hash, or None."""
+        position = self.hash_index().get(bytes.fromhex(block_hash))
+        return None if position is None else BlockView(self, position)
+
+    def ancestors(self, block_hash):
+        """Yields the block with block_hash and then each parent back to genesis."""
+        block = self.find(block_hash)
+        while block is not None:
+            yield block
+            block = self.find(block['BlockHeader']['prevBlockHash'])
+
+    def append(self, block):
+        """Packs a Block whose BlockHeader is a header object and stores it."""
+        record = pack_record(block)
+        self.records += record
+        # Ohne TxBodyStore nur die Bodies behalten, nicht die Merkle-Blätter und den Pool einer GeneratedTransactions
+        self.txs.append(list(block.Txs) if self.tx_store is None else self.tx_store.keep(block.Txs))
+        self.positions[record[-32:]] = len(self.txs) - 1
+        if self.tx_store is not None:
+            self.tx_store.appended(self.txs)
+
+    def truncate(self, length):
+        """Drops every block from position length on, e.g. to switch to another branch."""
+        for index in range(length, len(self)):
+            del self.positions[self.unpack(index)[-1]]
+        del self.records[length * RECORD.size:]
+        del self.txs[length:]
+        if self.tx_store is not None:
+            self.tx_store.truncated(length)
+
+def pack_record(block):
+    header = block.BlockHeader
+    return RECORD.pack(
+        block.Height, block.Blocksize, block.Txcount,
+        header.version, bytes.fromhex(header.prevBlockHash), bytes.fromhex(header.merkleRoot),
+        header.timestamp, bytes.fromhex(header.bits), header.nonce, bytes.fromhex(header.blockHash))
+
+# Eintrag in der Segmentdatei: Länge | Record | (Länge | Transaktion) * Txcount
+LENGTH = struct.Struct('<I')
+
+class BlockFileStore(ChainStore):
+    """ChainStore persisted as a segment file plus a height index, appended to and truncated at the end.
+
+    path holds the block entries, path + '.idx' the file offset of every
+    height. Reads go through mmap, so headers and transactions are only
+    loaded when accessed, and reopening an existing file resumes the chain
+    without replaying it. A torn write at the end is truncated on open.
+    """
+    def __init__(self, path, sync=False):
+        self.path = path
+        self.index_path = path + '.idx'
+        self.sync = sync  # fsync after every block
+        self.offsets = array.array('Q')
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as f:
+                data = f.read()
+            # Halb geschriebener letzter Indexeintrag: abschneiden, _recover kürzt die Datei
+            self.offsets.frombytes(data[:len(data) - len(data) % self.offsets.itemsize])
+        self.data_file = open(path, 'ab')
+        self.index_file = open(self.index_path, 'ab')
+        self.map = None
+        self.lock = threading.Lock()  # Leser aus GUI- und Mining-Thread teilen sich die Map
+        self.positions = None  # Hash-Index wird erst bei der ersten Suche aufgebaut
+        self._recover()
+
+    def _recover(self):
+        size = os.path.getsize(self.path)
+        with open(self.path, 'rb') as f:
+            while self.offsets:
+                offset = self.offsets[-1]
+                f.seek(offset)
+                prefix = f.read(LENGTH.size)
+                if len(prefix) == LENGTH.size and offset + LENGTH.size + LENGTH.unpack(prefix)[0] <= size:
+                    end = offset + LENGTH.size + LENGTH.unpack(prefix)[0]
+                    break
+                self.offsets.pop()
+            else:
+                end = 0
+        if size > end or os.path.getsize(self.index_path) != len(self.offsets) * self.offsets.itemsize:
+            self.data_file.truncate(end)
+            self.index_file.truncate(len(self.offsets) * self.offsets.itemsize)
+        self.data_file.seek(0, os.SEEK_END)
+        self.index_file.seek(0, os.SEEK_END)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __bool__(self):
+        return bool(self.offsets)
+
+    def _view(self, offset, length):
+        # Nur unter self.lock aufrufen: die alte Map wird geschlossen, sobald über ihr Ende gelesen wird
+        if self.map is None or offset + length > len(self.map):
+            self._close_map()
+            with open(self.path, 'rb') as f:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.map
+
+    def _close_map(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def unpack(self, index):
+        offset = self.offsets[index] + LENGTH.size
+        with self.lock:
+            return RECORD.unpack_from(self._view(offset, RECORD.size), offset)
+
+    def load_txs(self, index):
+        start = self.offsets[index]
+        with self.lock:
+            view = self._view(start, LENGTH.size)
+            end = start + LENGTH.size + LENGTH.unpack_from(view, start)[0]
+            view = self._view(start, end - start)
+            offset = start + LENGTH.size + RECORD.size
+            txs = []
+            while offset < end:
+                (length,) = LENGTH.unpack_from(view, offset)
+                offset += LENGTH.size
+                txs.append(view[offset:offset + length])
+                offset += length
+        return txs
+
+    def hash_index(self):
+        if self.positions is None:
+            self.positions = {self.unpack(index)[-1]: index for index in range(len(self))}
+        return self.positions
+
+    def append(self, block):
+        body = [pack_record(block)]
+        for tx in block.Txs:
+            body.append(LENGTH.pack(len(tx)))
+            body.append(tx)
+        entry = b''.join(body)
+        offset = self.data_file.tell()
+        self.data_file.write(LENGTH.pack(len(entry)) + entry)
+        self.data_file.flush()
+        if self.sync:
+            os.fsync(self.data_file.fileno())
+        # Index erst nach den Blockdaten schreiben, damit er nie auf fehlende Daten zeigt
+        self.index_file.write(array.array('Q', [offset]).tobytes())
+        self.index_file.flush()
+        self.offsets.append(offset)
+        if self.positions is not None:
+            self.positions[body[0][-32:]] = len(self.offsets) - 1
+
+    def truncate(self, length):
+        """Drops every block from position length on by cutting the index and segment file back."""
+        if length >= len(self):
+            return
+        end = self.offsets[length]
+        if self.positions is not None:
+            for index in range(length, len(self)):
+                del self.positions[self.unpack(index)[-1]]
+        del self.offsets[length:]
+        with self.lock:
+            # Eine gemappte Datei lässt sich unter Windows nicht kürzen
+            self._close_map()
+            # Erst den Index kürzen, damit er auch bei einem Absturz nie auf fehlende Daten zeigt
+            self.index_file.truncate(len(self.offsets) * self.offsets.itemsize)
+            self.data_file.truncate(end)
+        if self.sync:
+            os.fsync(self.index_file.fileno())
+            os.fsync(self.data_file.fileno())
+        self.data_file.seek(0, os.SEEK_END)
+        self.index_file.seek(0, os.SEEK_END)
+
+    def close(self):
+        with self.lock:
+            self._close_map()
+        self.data_file.close()
+        self.index_file.close()
@@ -0,0 +1,99 @@
+import queue
+
+class FrameRenderer:
+    """Moves GUI updates from producer threads onto the Tk main loop at a fixed frame rate.
+
+    Producer threads only call post(), which is thread-safe and never touches
+    Tk. Every 1/fps seconds the main loop runs the posted callbacks in order
+    and then each frame callback once, so redraws are batched per frame
+    instead of per block.
+    """
+    def __init__(self, root, fps=10, max_events_per_frame=10_000):
+        self.root = root
+        self.interval = max(1, int(1000 / fps))
+        self.max_events_per_frame = max_events_per_frame
+        self.events = queue.SimpleQueue()
+        self.frame_callbacks = []
+
+    def post(self, callback, *args):
+        """Schedules callback(*args) on the Tk main loop; safe to call from any thread."""
+        self.events.put((callback, args))
+
+    def on_frame(self, callback):
+        """Registers callback() to run once per frame after the posted events."""
+        self.frame_callbacks.append(callback)
+
+    def start(self):
+        self.root.after(self.interval, self.frame)
+
+    def frame(self):
+        try:
+            for _ in range(self.max_events_per_frame):
+                try:
+                    callback, args = self.events.get_nowait()
+                except queue.Empty:
+                    break
+                callback(*args)
+            for callback in self.frame_callbacks:
+                callback()
+        finally:
+            # Auch nach einem fehlerhaften Callback weiterzeichnen; Tk meldet die Ausnahme selbst
+            self.root.after(self.interval, self.frame)
+
+class IncrementalPlot:
+    """Line plot that keeps one Line2D and updates it with set_data.
+
+    At most max_points points are drawn; longer series are downsampled by a
+    fixed stride, always keeping the newest point.
+    """
+    def __init__(self, ax, canvas, xlabel, ylabel, title, max_points=2000, **line_style):
+        self.ax = ax
+        self.canvas = canvas
+        self.max_points = max_points
+        self.x = []
+        self.y = []
+        self.dirty = False
+        self.line, = ax.plot([], [], **line_style)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+
+    def append(self, x, y):
+        self.x.append(x)
+        self.y.append(y)
+        self.dirty = True
+
+    def flush(self):
+        if not self.dirty:
+            return
+        self.dirty = False
+        stride = max(1, -(-len(self.x) // self.max_points))
+        x = self.x[::stride]
+        y = self.y[::stride]
+        if (len(self.x) - 1) % stride:
+            x.append(self.x[-1])
+            y.append(self.y[-1])
+        self.line.set_data(x, y)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+
+class BoundedTable:
+    """Treeview wrapper that shows only the newest max_rows rows."""
+    def __init__(self, tree, max_rows=500):
+        self.tree = tree
+        self.max_rows = max_rows
+        self.pending = []
+
+    def append(self, values):
+        self.pending.append(values)
+
+    def flush(self):
+        if not self.pending:
+            return
+        rows, self.pending = self.pending[-self.max_rows:], []
+        for values in rows:
+            self.tree.insert('', 'end', values=values)
+        children = self.tree.get_children()
+        if len(children) > self.max_rows:
+            self.tree.delete(*children[:len(children) - self.max_rows])
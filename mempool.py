@@ -0,0 +1,179 @@
+import queue
+import threading
+import time
+
+from transactions import TransactionPool
+
+class Mempool:
+    """Bounded transaction queue between producers and the block assembler.
+
+    Producers block in put() while the queue is full (backpressure); the time
+    they spend waiting is reported by metrics() together with queue depths.
+    take() is meant for a single consumer.
+    """
+    def __init__(self, max_size=10_000):
+        self.queue = queue.Queue(maxsize=max_size)
+        self.lock = threading.Lock()
+        self.carry = None  # Transaktion, die nicht mehr ins letzte Byte-Budget passte
+        self.added = 0
+        self.taken = 0
+        self.bytes_taken = 0
+        self.peak_depth = 0
+        self.depth_samples = 0
+        self.depth_sum = 0
+        self.producer_wait = 0.0
+
+    def put(self, transaction, timeout=None):
+        """Adds a transaction, waiting while the mempool is full. Raises queue.Full on timeout."""
+        start = time.perf_counter()
+        self.queue.put(transaction, timeout=timeout)
+        waited = time.perf_counter() - start
+        with self.lock:
+            self.added += 1
+            self.producer_wait += waited
+            self.peak_depth = max(self.peak_depth, self.queue.qsize())
+
+    def take(self, max_count=None, max_bytes=None, timeout=None):
+        """Pulls transactions up to max_count and max_bytes, waiting up to timeout for the first one."""
+        depth = self.queue.qsize()
+        transactions = []
+        size = 0
+        while max_count is None or len(transactions) < max_count:
+            if self.carry is not None:
+                transaction, self.carry = self.carry, None
+            else:
+                try:
+                    if transactions:
+                        transaction = self.queue.get_nowait()
+                    else:
+                        transaction = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            if max_bytes is not None and transactions and size + len(transaction) > max_bytes:
+                self.carry = transaction
+                break
+            transactions.append(transaction)
+            size += len(transaction)
+            if max_count is None and max_bytes is None and self.queue.empty():
+                break
+        with self.lock:
+            self.taken += len(transactions)
+            self.bytes_taken += size
+            self.depth_samples += 1
+            self.depth_sum += depth
+        return transactions
+
+    def depth(self):
+        return self.queue.qsize() + (self.carry is not None)
+
+    def metrics(self):
+        """Returns queue-depth and backpressure statistics."""
+        with self.lock:
+            return {
+                'depth': self.depth(),
+                'peak_depth': self.peak_depth,
+                'avg_depth_at_take': self.depth_sum / self.depth_samples if self.depth_samples else 0.0,
+                'added': self.added,
+                'taken': self.taken,
+                'bytes_taken': self.bytes_taken,
+                'producer_wait_s': self.producer_wait,
+            }
+
+class TransactionProducer(threading.Thread):
+    """Streams transactions of tx_size bytes into a mempool, optionally rate-limited."""
+    def __init__(self, mempool, tx_size, rate=None, seed=None):
+        super().__init__(daemon=True)
+        self.mempool = mempool
+        self.tx_size = tx_size
+        self.rate = rate  # Transaktionen pro Sekunde, None = so schnell wie möglich
+        self.pool = TransactionPool(seed=seed)
+        self.stopped = threading.Event()
+
+    def run(self):
+        interval = 1.0 / self.rate if self.rate else 0.0
+        next_time = time.perf_counter()
+        while not self.stopped.is_set():
+            try:
+                self.mempool.put(self.pool.create_transaction(self.tx_size), timeout=0.1)
+            except queue.Full:
+                continue
+            if interval:
+                next_time += interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+    def stop(self):
+        self.stopped.set()
+
+class BlockAssembler(threading.Thread):
+    """Pulls transactions from the mempool and prepares (transactions, merkleRoot) for upcoming blocks.
+
+    Up to lookahead blocks are assembled ahead, so block N+1 is built while
+    block N is still being validated.
+    """
+    def __init__(self, mempool, create_merkle_root, max_count=None, max_bytes=None, lookahead=1):
+        super().__init__(daemon=True)
+        self.mempool = mempool
+        self.create_merkle_root = create_merkle_root
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.ready = queue.Queue(maxsize=lookahead)
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            transactions = self.mempool.take(self.max_count, self.max_bytes, timeout=0.1)
+            if not transactions:
+                continue
+            assembled = (transactions, self.create_merkle_root(transactions))
+            while not self.stopped.is_set():
+                try:
+                    self.ready.put(assembled, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def next_block(self, timeout=None):
+        """Returns the next assembled (transactions, merkleRoot) pair."""
+        return self.ready.get(timeout=timeout)
+
+    def stop(self):
+        self.stopped.set()
+
+def stream_blocks(chain, num_blocks, tx_size, max_count=None, max_bytes=None, producers=1,
+                  rate=None, mempool_size=10_000, lookahead=1):
+    """Adds num_blocks blocks to a PoA Blockchain or Chain from a continuously filled mempool.
+
+    Returns end-to-end throughput together with the mempool metrics.
+    """
+    mempool = Mempool(mempool_size)
+    producer_threads = [TransactionProducer(mempool, tx_size, rate, seed=i) for i in range(producers)]
+    assembler = BlockAssembler(mempool, chain.create_merkle_root, max_count, max_bytes, lookahead)
+    for thread in producer_threads:
+        thread.start()
+    assembler.start()
+    tx_count = 0
+    block_times = []
+    start = time.perf_counter()
+    try:
+        for _ in range(num_blocks):
+            transactions, merkleRoot = assembler.next_block()
+            lastBlock = chain.get_last_block()
+            BlockHeight = lastBlock["Height"] + 1 if lastBlock else 0
+            prevBlockHash = lastBlock['BlockHeader']['blockHash'] if lastBlock else '0' * 64
+            block_times.append(chain.addBlockFromTransactions(BlockHeight, prevBlockHash, transactions, merkleRoot))
+            tx_count += len(transactions)
+    finally:
+        elapsed = time.perf_counter() - start
+        assembler.stop()
+        for thread in producer_threads:
+            thread.stop()
+    return {
+        'blocks': num_blocks,
+        'transactions': tx_count,
+        'elapsed_s': elapsed,
+        'tps': tx_count / elapsed if elapsed > 0 else 0.0,
+        'block_times': block_times,
+        'mempool': mempool.metrics(),
+    }
@@ -0,0 +1,118 @@
+import hashlib
+
+# Ab dieser Levelgröße und Eingabelänge werden Hashes auf den Thread-Pool verteilt;
+# hashlib gibt den GIL erst ab 2 KiB frei, darunter (z. B. 64-Byte-Paare der inneren Level) bringt er nichts
+PARALLEL_THRESHOLD = 64
+PARALLEL_MIN_BYTES = 2048
+# Anzahl der Hashes pro Thread-Pool-Aufgabe
+BATCH_SIZE = 64
+
+EMPTY_ROOT = b'\x00' * 32
+
+def hash256(s):
+    """Two rounds of SHA256"""
+    return hashlib.sha256(hashlib.sha256(s).digest()).digest()
+
+def sha256(s):
+    """One round of SHA256"""
+    return hashlib.sha256(s).digest()
+
+def _hash_batch(hash_function, items):
+    return [hash_function(item) for item in items]
+
+def hash_all(items, hash_function, executor=None):
+    """Hashes every item, spreading large inputs across executor in batches.
+
+    hashlib only releases the GIL for inputs of 2 KiB and more, so only
+    levels of at least PARALLEL_MIN_BYTES per item go to the pool, i.e. the
+    leaves of large transactions.
+    """
+    if executor is None or len(items) < PARALLEL_THRESHOLD or len(items[0]) < PARALLEL_MIN_BYTES:
+        return [hash_function(item) for item in items]
+    batches = [items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)]
+    hashes = []
+    for batch in executor.map(_hash_batch, [hash_function] * len(batches), batches):
+        hashes.extend(batch)
+    return hashes
+
+class MerkleTree:
+    """Merkle tree over raw 32-byte digests that keeps all of its levels.
+
+    An odd node at the end of a level is paired with itself, as in Bitcoin.
+    Appending a transaction only rehashes the O(log n) nodes on its path.
+    """
+    def __init__(self, transactions=(), hash_function=hash256, executor=None):
+        self.hash_function = hash_function
+        self.levels = [hash_all(list(transactions), hash_function, executor)]
+        self._build(executor)
+
+    @classmethod
+    def from_leaves(cls, leaf_hashes, hash_function=hash256, executor=None):
+        """Builds the tree over already hashed leaves, e.g. stored transaction hashes."""
+        tree = cls.__new__(cls)
+        tree.hash_function = hash_function
+        tree.levels = [list(leaf_hashes)]
+        tree._build(executor)
+        return tree
+
+    def _build(self, executor):
+        self.levels = self.levels[:1]
+        nodes = self.levels[0]
+        while len(nodes) > 1:
+            pairs = [nodes[i] + (nodes[i + 1] if i + 1 < len(nodes) else nodes[i])
+                     for i in range(0, len(nodes), 2)]
+            nodes = hash_all(pairs, self.hash_function, executor)
+            self.levels.append(nodes)
+
+    def __len__(self):
+        return len(self.levels[0])
+
+    @property
+    def root(self):
+        return self.levels[-1][0] if self.levels[0] else EMPTY_ROOT
+
+    def root_hex(self):
+        return self.root.hex()
+
+    def append(self, transaction):
+        """Adds one transaction and updates the path from its leaf to the root."""
+        self.append_leaf(self.hash_function(transaction))
+
+    def append_leaf(self, leaf_hash):
+        self.levels[0].append(leaf_hash)
+        index = len(self.levels[0]) - 1
+        level = 0
+        while len(self.levels[level]) > 1:
+            nodes = self.levels[level]
+            parent_index = index // 2
+            left = nodes[2 * parent_index]
+            right = nodes[2 * parent_index + 1] if 2 * parent_index + 1 < len(nodes) else left
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            parents = self.levels[level + 1]
+            parent = self.hash_function(left + right)
+            if parent_index < len(parents):
+                parents[parent_index] = parent
+            else:
+                parents.append(parent)
+            index = parent_index
+            level += 1
+
+    def proof(self, index):
+        """Returns the inclusion proof for the leaf at index as (sibling_hash, sibling_is_left) pairs."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Transaction index {index} out of range")
+        path = []
+        for nodes in self.levels[:-1]:
+            sibling_index = index ^ 1
+            sibling = nodes[sibling_index] if sibling_index < len(nodes) else nodes[index]
+            path.append((sibling, sibling_index < index))
+            index //= 2
+        return path
+
+def verify_proof(leaf_hash, proof, root, hash_function=hash256):
+    """Checks an inclusion proof from MerkleTree.proof against a root digest."""
+    node = leaf_hash
+    for sibling, sibling_is_left in proof:
+        node = hash_function(sibling + node if sibling_is_left else node + sibling)
+    return node == root
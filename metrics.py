@@ -0,0 +1,149 @@
+import array
+import collections
+import math
+import time
+
+class TimeSeries:
+    """Append-only series of floats in a compact array('d') with a running total."""
+    __slots__ = ('values', 'total')
+
+    def __init__(self, values=()):
+        self.values = array.array('d', values)
+        self.total = sum(self.values)
+
+    def append(self, value):
+        self.values.append(value)
+        self.total += value
+
+    def mean(self):
+        return self.total / len(self.values) if self.values else 0.0
+
+    def __len__(self):
+        return len(self.values)
+
+    def __bool__(self):
+        return bool(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+class P2Quantile:
+    """Streaming quantile estimate with the P² algorithm: five markers, O(1) per value."""
+    __slots__ = ('p', 'count', 'heights', 'positions', 'desired', 'increments')
+
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                # Parabolische Vorhersage, bei Verletzung der Monotonie linear
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    def value(self):
+        if not self.heights:
+            return 0.0
+        if self.count <= 5:
+            return self.heights[max(0, min(len(self.heights) - 1, math.ceil(self.p * len(self.heights)) - 1))]
+        return self.heights[2]
+
+class StreamingMetrics:
+    """Block metrics with constant cost per block regardless of chain length.
+
+    Keeps running totals, TPS and block rate over a rolling window of
+    window seconds, and p50/p95/p99 of the block time via P² sketches.
+    """
+    def __init__(self, window=10.0, quantiles=(0.5, 0.95, 0.99)):
+        self.window = window
+        self.blocks = 0
+        self.transactions = 0
+        self.block_time_total = 0.0
+        self.recent = collections.deque()  # (now, tx_count) innerhalb des Fensters
+        self.recent_transactions = 0
+        self.first_seen = None
+        self.sketches = {q: P2Quantile(q) for q in quantiles}
+
+    def record(self, block_time, tx_count, now=None):
+        now = time.perf_counter() if now is None else now
+        if self.first_seen is None:
+            self.first_seen = now
+        self.blocks += 1
+        self.transactions += tx_count
+        self.block_time_total += block_time
+        self.recent.append((now, tx_count))
+        self.recent_transactions += tx_count
+        while self.recent and self.recent[0][0] < now - self.window:
+            self.recent_transactions -= self.recent.popleft()[1]
+        for sketch in self.sketches.values():
+            sketch.add(block_time)
+
+    def mean_block_time(self):
+        return self.block_time_total / self.blocks if self.blocks else 0.0
+
+    def tps(self):
+        """Transactions per second of block time over the whole run."""
+        return self.transactions / self.block_time_total if self.block_time_total > 0 else 0.0
+
+    def _window_span(self):
+        if not self.recent:
+            return 0.0
+        return min(self.window, self.recent[-1][0] - self.first_seen)
+
+    def rolling_tps(self):
+        span = self._window_span()
+        return self.recent_transactions / span if span > 0 else 0.0
+
+    def rolling_block_rate(self):
+        span = self._window_span()
+        return len(self.recent) / span if span > 0 else 0.0
+
+    def quantile(self, q):
+        return self.sketches[q].value()
+
+    def snapshot(self):
+        return {
+            'blocks': self.blocks,
+            'transactions': self.transactions,
+            'mean_block_time': self.mean_block_time(),
+            'tps': self.tps(),
+            'rolling_tps': self.rolling_tps(),
+            'rolling_block_rate': self.rolling_block_rate(),
+            **{f'p{round(q * 100)}': sketch.value() for q, sketch in self.sketches.items()},
+        }
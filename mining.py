@@ -0,0 +1,237 @@
+import hashlib
+import math
+import multiprocessing
+import os
+import queue
+import struct
+import time
+
+# Anzahl der Nonces, die ein Worker am Stück prüft, bevor er das Stop-Signal abfragt
+NONCE_CHUNK_SIZE = 4096
+
+# Telemetrie: Nonces pro Zählerupdate im Einzelprozess, Abfrageintervall der Worker-Zähler in Sekunden
+TELEMETRY_CHUNK_SIZE = 4096
+TELEMETRY_INTERVAL = 0.1
+
+# 80-Byte-Header wie bei Bitcoin: version, prev_hash, merkle_root, timestamp, bits | nonce
+HEADER_PREFIX = struct.Struct('<I32s32sII')
+NONCE = struct.Struct('<I')
+MAX_NONCE = 0xFFFFFFFF
+MAX_TARGET = (1 << 256) - 1  # Schwierigkeit 0: jeder Hash ist gültig
+
+def hash256(s):
+    """Two rounds of SHA256"""
+    return hashlib.sha256(hashlib.sha256(s).digest()).digest()
+
+def difficulty_to_target(difficulty):
+    """Converts a difficulty in leading hex zeros (fractions allowed) into a 256-bit target."""
+    return int(2 ** (256 - 4 * difficulty)) - 1
+
+def target_to_difficulty(target):
+    """Inverse of difficulty_to_target: the difficulty in (fractional) leading hex zeros."""
+    return (256 - math.log2(target + 1)) / 4
+
+def target_to_bits(target):
+    """Encodes a target in Bitcoin's compact 'bits' format."""
+    size = (target.bit_length() + 7) // 8
+    if size <= 3:
+        mantissa = target << (8 * (3 - size))
+    else:
+        mantissa = target >> (8 * (size - 3))
+    if mantissa & 0x00800000:
+        mantissa >>= 8
+        size += 1
+    return (size << 24) | mantissa
+
+def bits_to_target(bits):
+    """Decodes Bitcoin's compact 'bits' format into a 256-bit target."""
+    size = bits >> 24
+    mantissa = bits & 0x007FFFFF
+    if size <= 3:
+        return mantissa >> (8 * (3 - size))
+    return mantissa << (8 * (size - 3))
+
+def pack_header_prefix(version, prev_hash, merkle_root, timestamp, bits):
+    """Packs the constant first 76 bytes of the header; the 4-byte nonce follows."""
+    return HEADER_PREFIX.pack(version, bytes.fromhex(prev_hash), bytes.fromhex(merkle_root), timestamp, bits)
+
+def search_nonces(prefix, target, start, stop):
+    """Tries nonces in [start, stop) and returns (nonce, block_hash) for the first hash <= target."""
+    midstate = hashlib.sha256(prefix)  # Konstanten Header-Teil nur einmal hashen
+    target_bytes = target.to_bytes(32, 'big')
+    sha256 = hashlib.sha256
+    pack_nonce = NONCE.pack
+    for nonce in range(start, stop):
+        inner = midstate.copy()
+        inner.update(pack_nonce(nonce))
+        digest = sha256(inner.digest()).digest()
+        if digest <= target_bytes:
+            return nonce, digest.hex()
+    return None
+
+class MiningTelemetry:
+    """Mining progress shared between the mining loop and a reader polling at a low rate.
+
+    The miner only adds to counters once per chunk of nonces and never does
+    I/O; sample() derives the hash rate from the counter deltas between two
+    calls, so it should have a single reader (GUI frame, log timer).
+    """
+    def __init__(self):
+        self.blocks = 0
+        self.finished_hashes = 0  # Hashes aller fertigen Blöcke
+        self.current_hashes = 0  # Hashes des Blocks, der gerade gemint wird
+        self.expected_hashes = 0.0
+        self.mining = False
+        self.last_sample = (time.perf_counter(), 0)
+
+    def start_block(self, target):
+        self.expected_hashes = (1 << 256) / (target + 1)
+        self.current_hashes = 0
+        self.mining = True
+
+    def add(self, count):
+        self.current_hashes += count
+
+    def finish_block(self):
+        current, self.current_hashes = self.current_hashes, 0
+        self.finished_hashes += current
+        self.blocks += 1
+        self.mining = False
+
+    @property
+    def total_hashes(self):
+        return self.finished_hashes + self.current_hashes
+
+    def sample(self):
+        """Returns nonces/s since the previous sample, ETA for the current block and hashes per block."""
+        now, total = time.perf_counter(), self.total_hashes
+        last_time, last_total = self.last_sample
+        self.last_sample = (now, total)
+        rate = max(0, total - last_total) / (now - last_time) if now > last_time else 0.0
+        return {
+            'nonces_per_s': rate,
+            # Mining ist gedächtnislos: die erwartete Restarbeit ist unabhängig vom Fortschritt
+            'eta_s': self.expected_hashes / rate if self.mining and rate > 0 else None,
+            'expected_hashes': self.expected_hashes,
+            'current_hashes': self.current_hashes,
+            'hashes_per_block': self.finished_hashes / self.blocks if self.blocks else 0.0,
+            'blocks': self.blocks,
+        }
+
+def resolve_workers(workers):
+    """Returns the effective worker count; None or 0 means one worker per CPU core."""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+def mining_worker(worker_id, jobs, results, found, counts):
+    """Long-lived worker process: searches every workers-th nonce range of each job until any worker succeeds.
+
+    counts[worker_id] is this worker's cumulative number of tried nonces,
+    read by the parent for telemetry. Every job gets exactly one reply.
+    """
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job_id, prefix, target, workers, chunk_size = job
+        start = worker_id * chunk_size
+        stride = workers * chunk_size
+        result = None
+        while start <= MAX_NONCE and not found.is_set():
+            stop = min(start + chunk_size, MAX_NONCE + 1)
+            result = search_nonces(prefix, target, start, stop)
+            if result:
+                counts[worker_id] += result[0] - start + 1
+                found.set()
+                break
+            counts[worker_id] += stop - start
+            start += stride
+        results.put((job_id, result))  # None: gestoppt oder eigener Nonce-Bereich erschöpft
+
+class MiningPool:
+    """Worker processes that stay alive across headers, so each block only costs two queue round trips.
+
+    The processes are started on the first mine() call and run until close().
+    """
+    def __init__(self, workers=None, chunk_size=NONCE_CHUNK_SIZE):
+        self.workers = resolve_workers(workers)
+        self.chunk_size = chunk_size
+        self.processes = []
+        self.job_id = 0
+
+    def start(self):
+        if self.processes:
+            return
+        ctx = multiprocessing.get_context()
+        self.found = ctx.Event()
+        self.results = ctx.Queue()
+        self.jobs = [ctx.Queue() for _ in range(self.workers)]
+        # Jeder Worker schreibt nur seinen eigenen Zähler, daher ohne Lock
+        self.counts = ctx.Array('Q', self.workers, lock=False)
+        self.processes = [
+            ctx.Process(target=mining_worker,
+                        args=(worker_id, self.jobs[worker_id], self.results, self.found, self.counts),
+                        name=f"miner-{worker_id}", daemon=True)
+            for worker_id in range(self.workers)
+        ]
+        for process in self.processes:
+            process.start()
+
+    def mine(self, prefix, target, telemetry=None):
+        """Mines prefix across all workers; returns (nonce, block_hash) or None if no nonce fits.
+
+        With a MiningTelemetry the tried nonces of all workers are added to it
+        every TELEMETRY_INTERVAL seconds.
+        """
+        self.start()
+        self.job_id += 1
+        self.found.clear()
+        reported = sum(self.counts)
+        for jobs in self.jobs:
+            jobs.put((self.job_id, prefix, target, self.workers, self.chunk_size))
+        result = None
+        received = 0
+        try:
+            while received < self.workers:
+                try:
+                    job_id, worker_result = self.results.get(timeout=TELEMETRY_INTERVAL)
+                except queue.Empty:
+                    if not all(process.is_alive() for process in self.processes):
+                        raise RuntimeError('mining worker exited unexpectedly') from None
+                    if telemetry is not None:
+                        tried = sum(self.counts)
+                        telemetry.add(tried - reported)
+                        reported = tried
+                    continue
+                if job_id != self.job_id:
+                    continue  # Antwort auf einen abgebrochenen früheren Auftrag
+                received += 1
+                if worker_result and result is None:
+                    result = worker_result
+                    self.found.set()
+        finally:
+            # Übrige Worker stoppen; sie melden sich spätestens nach einem Abschnitt von chunk_size Nonces
+            self.found.set()
+        if telemetry is not None:
+            telemetry.add(sum(self.counts) - reported)
+        return result
+
+    def close(self):
+        """Stops and joins the worker processes."""
+        for jobs in self.jobs if self.processes else ():
+            jobs.put(None)
+        for process in self.processes:
+            process.join()
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def parallel_mine(prefix, target, workers=None, chunk_size=NONCE_CHUNK_SIZE, telemetry=None):
+    """Mines prefix once with a temporary MiningPool; chains keep their pool across blocks instead."""
+    with MiningPool(workers, chunk_size) as pool:
+        return pool.mine(prefix, target, telemetry)
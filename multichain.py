@@ -0,0 +1,35 @@
+import poa_base
+from merkle import MerkleTree, sha256
+from poa_base import Block
+from transactions import create_transactions
+
+class BlockHeader(poa_base.BlockHeader):
+    __slots__ = ()
+    hash_function = staticmethod(sha256)
+
+def check_blocks(items):
+    """Recomputes header hashes and Merkle roots for a range of blocks; returns (height, problem) pairs."""
+    return poa_base.check_blocks(items, BlockHeader)
+
+class Chain(poa_base.PoAChain):
+    header_class = BlockHeader
+    check_blocks = staticmethod(check_blocks)
+    log_format = "{chain.chain_type} {chain.chain_id} - Block {block.Height} created in {creation_time:.2f} seconds with PoA."
+
+    def __init__(self, chain_type, chain_id, validation_delay=0.1, merkle_executor=None, store=None, clock=None,
+                 tracer=None):
+        self.chain_type = chain_type
+        self.chain_id = chain_id
+        super().__init__(validation_delay, merkle_executor, store, clock, tracer)
+        if not self.blockchain:  # A reopened BlockFileStore already has its genesis block
+            self.GenesisBlock()
+
+    def GenesisBlock(self):
+        self.create_genesis_block()
+
+def assemble_block(transaction_size, tx_count):
+    """Generates transactions and their Merkle root; module-level so it can run in a process pool."""
+    transactions = create_transactions(tx_count, transaction_size)
+    tree = MerkleTree(transactions, sha256)
+    transactions.keep_leaves(sha256, tree.levels[0])
+    return transactions, tree.root_hex()
@@ -0,0 +1,272 @@
+"""Local multi-node network simulation with block gossip, forks and reorgs.
+
+Every node holds its own PoA Blockchain. Nodes produce competing blocks
+and gossip them over a simulated peer-to-peer topology; each link has a
+latency, some jitter and a bandwidth. Everything runs as events on one
+virtual clock, with no real network and no sleeping.
+
+There are two ways to produce blocks:
+- pow: every node finds blocks after exponentially distributed times with
+  its share of the hash power, so blocks arrive every block_interval on
+  average.
+- poa: authorities take turns in fixed slots of block_interval.
+
+A node that receives a block on a longer branch switches its chain to that
+branch; this is the longest-chain reorganization. The output shows, as the
+node count grows:
+- the distribution of propagation delays
+- the stale-block rate
+- reorganizations
+- effective throughput
+
+    python netsim.py --nodes 4 8 16 32 --blocks 200 --block-interval 2 --latency 0.1 --bandwidth 1e6
+"""
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import json
+import math
+import os
+import random
+import sys
+
+from benchmark import percentile
+from poa_chain import Blockchain
+from simclock import Simulator, VirtualClock
+from transactions import create_transactions
+
+# Größe eines Headers auf dem Draht, Transaktionen kommen hinzu
+HEADER_SIZE = 80
+
+def block_size(block):
+    return HEADER_SIZE + sum(len(tx) for tx in block.Txs)
+
+class Link:
+    """One direction of a peer connection; transfers queue behind each other at bandwidth bytes/s."""
+    __slots__ = ('latency', 'bandwidth', 'busy_until')
+
+    def __init__(self, latency, bandwidth):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.busy_until = 0.0
+
+    def delay(self, now, size):
+        """Returns the time until a message of size bytes sent now has fully arrived."""
+        start = max(now, self.busy_until)
+        self.busy_until = start + size / self.bandwidth
+        return self.busy_until + self.latency - now
+
+class Network:
+    """Random connected topology (ring plus random peers) and per-block propagation statistics."""
+    def __init__(self, simulator, node_count, degree, latency, jitter, bandwidth, rng):
+        self.simulator = simulator
+        self.peers = [set() for _ in range(node_count)]
+        for node in range(node_count):
+            if node_count > 1:
+                self.connect(node, (node + 1) % node_count)  # Ring hält das Netz zusammenhängend
+        for node in range(node_count):
+            candidates = [peer for peer in range(node_count) if peer != node and peer not in self.peers[node]]
+            rng.shuffle(candidates)
+            while len(self.peers[node]) < min(degree, node_count - 1) and candidates:
+                self.connect(node, candidates.pop())
+        self.links = {(a, b): Link(latency + rng.uniform(0, jitter), bandwidth)
+                      for a in range(node_count) for b in self.peers[a]}
+        self.nodes = []
+        self.created = {}  # blockHash -> (Erzeugungszeit, Miner)
+        self.reached = collections.Counter()  # blockHash -> Anzahl Knoten, die den Block kennen
+        self.delays = []  # Ausbreitungsverzögerung je (Block, empfangender Knoten)
+        self.full_propagation = []  # Zeit, bis ein Block 90 % der Knoten erreicht hat
+
+    def connect(self, a, b):
+        self.peers[a].add(b)
+        self.peers[b].add(a)
+
+    def send(self, source, target, block, size):
+        delay = self.links[(source, target)].delay(self.simulator.now(), size)
+        self.simulator.schedule(delay, self.nodes[target].receive, block, source)
+
+    def seen(self, block_hash, node_id):
+        created_at, miner = self.created[block_hash]
+        self.reached[block_hash] += 1
+        if node_id != miner:
+            self.delays.append(self.simulator.now() - created_at)
+        if self.reached[block_hash] == math.ceil(0.9 * len(self.nodes)):
+            self.full_propagation.append(self.simulator.now() - created_at)
+
+class Node:
+    """A peer with its own Blockchain, a view of all known blocks and longest-chain fork choice."""
+    def __init__(self, node_id, network, clock, validation_delay):
+        self.node_id = node_id
+        self.network = network
+        self.chain = Blockchain(clock=clock)
+        self.validation_delay = validation_delay
+        self.known = {}  # blockHash -> Block, alle Zweige
+        self.pending = set()  # empfangen, Validierung läuft
+        self.orphans = collections.defaultdict(list)  # prevBlockHash -> [(Block, Absender)]
+        self.reorgs = 0
+        self.max_reorg_depth = 0
+
+    @property
+    def tip(self):
+        return self.chain.get_last_block()
+
+    def receive(self, block, sender):
+        block_hash = block.BlockHeader.blockHash
+        if block_hash in self.known or block_hash in self.pending:
+            return
+        self.pending.add(block_hash)
+        self.network.seen(block_hash, self.node_id)
+        self.network.simulator.schedule(self.validation_delay, self.accept, block, sender)
+
+    def accept(self, block, sender):
+        block_hash = block.BlockHeader.blockHash
+        self.pending.discard(block_hash)
+        if block.BlockHeader.prevBlockHash not in self.known and block.Height > 0:
+            self.orphans[block.BlockHeader.prevBlockHash].append((block, sender))
+            return
+        self.known[block_hash] = block
+        size = block_size(block)
+        for peer in self.network.peers[self.node_id]:
+            if peer != sender:
+                self.network.send(self.node_id, peer, block, size)
+        if block.Height >= len(self.chain.blockchain):
+            self.switch_to(block)
+        for child, child_sender in self.orphans.pop(block_hash, ()):
+            self.accept(child, child_sender)
+
+    def switch_to(self, block):
+        """Makes block the new tip, rolling back to the fork point if it is on another branch."""
+        store = self.chain.blockchain
+        branch = []
+        while not (block.Height < len(store) and self.chain.block_hash_at(block.Height) == block.BlockHeader.blockHash):
+            branch.append(block)
+            if block.Height == 0:
+                break
+            block = self.known[block.BlockHeader.prevBlockHash]
+        fork_height = branch[-1].Height
+        depth = len(store) - fork_height
+        if depth > 0:
+            self.reorgs += 1
+            self.max_reorg_depth = max(self.max_reorg_depth, depth)
+            store.truncate(fork_height)
+        for new_block in reversed(branch):
+            store.append(new_block)
+
+    def produce(self, tx_count, tx_size):
+        """Seals a block on the current tip, adopts it and gossips it to all peers."""
+        tip = self.tip
+        transactions = create_transactions(tx_count, tx_size)
+        block = self.chain.sealBlock(tip['Height'] + 1, tip['BlockHeader']['blockHash'], transactions,
+                                     self.chain.create_merkle_root(transactions))
+        self.network.created[block.BlockHeader.blockHash] = (self.network.simulator.now(), self.node_id)
+        self.network.seen(block.BlockHeader.blockHash, self.node_id)
+        self.accept(block, None)
+        return block
+
+def simulate(node_count, blocks, consensus='pow', block_interval=2.0, degree=4, latency=0.1, jitter=0.05,
+             bandwidth=1e6, validation_delay=0.01, tx_count=100, tx_size=100, seed=0):
+    """Runs one network until blocks blocks were produced and all gossip settled; returns its statistics."""
+    rng = random.Random(seed)
+    clock = VirtualClock(start=0.0)
+    simulator = Simulator(clock)
+    network = Network(simulator, node_count, degree, latency, jitter, bandwidth, rng)
+    network.nodes = [Node(node_id, network, clock, validation_delay) for node_id in range(node_count)]
+
+    # Gemeinsamer Genesis-Block, bei allen Knoten bereits bekannt
+    genesis_txs = create_transactions(1, tx_size)
+    genesis = network.nodes[0].chain.sealBlock(0, '0' * 64, genesis_txs,
+                                               network.nodes[0].chain.create_merkle_root(genesis_txs))
+    for node in network.nodes:
+        node.known[genesis.BlockHeader.blockHash] = genesis
+        node.chain.blockchain.append(genesis)
+
+    produced = 0
+
+    def mine(node):
+        nonlocal produced
+        if produced >= blocks:
+            return
+        produced += 1
+        node.produce(tx_count, tx_size)
+        # Gedächtnisloses Mining: nächste Lösung dieses Knotens unabhängig vom bisherigen Fortschritt
+        simulator.schedule(rng.expovariate(1 / (block_interval * node_count)), mine, node)
+
+    def slot(number):
+        nonlocal produced
+        if produced >= blocks:
+            return
+        produced += 1
+        network.nodes[number % node_count].produce(tx_count, tx_size)
+        simulator.schedule(block_interval, slot, number + 1)
+
+    if consensus == 'pow':
+        for node in network.nodes:
+            simulator.schedule(rng.expovariate(1 / (block_interval * node_count)), mine, node)
+    else:
+        simulator.schedule(block_interval, slot, 1)
+    simulator.run()
+
+    reference = network.nodes[0].chain
+    main_chain = reference.blockchain
+    main_txs = sum(block['Txcount'] for block in main_chain[1:])
+    last_created = max((created_at for created_at, _ in network.created.values()), default=0.0)
+    tips = collections.Counter(node.tip['BlockHeader']['blockHash'] for node in network.nodes)
+    return {
+        'nodes': node_count,
+        'consensus': consensus,
+        'blocks_produced': produced,
+        'main_chain_blocks': len(main_chain) - 1,
+        'stale_blocks': produced - (len(main_chain) - 1),
+        'stale_rate': (produced - (len(main_chain) - 1)) / produced if produced else 0.0,
+        'reorgs': sum(node.reorgs for node in network.nodes),
+        'max_reorg_depth': max(node.max_reorg_depth for node in network.nodes),
+        'propagation_p50_s': percentile(network.delays, 0.50),
+        'propagation_p90_s': percentile(network.delays, 0.90),
+        'propagation_p99_s': percentile(network.delays, 0.99),
+        'reach_90pct_mean_s': (sum(network.full_propagation) / len(network.full_propagation)
+                               if network.full_propagation else 0.0),
+        'simulated_s': last_created,
+        'effective_blocks_per_s': (len(main_chain) - 1) / last_created if last_created > 0 else 0.0,
+        'effective_tps': main_txs / last_created if last_created > 0 else 0.0,
+        'nodes_on_main_tip': tips[main_chain[-1]['BlockHeader']['blockHash']],
+        'valid': reference.validate_chain(workers=1)['valid'],
+    }
+
+def run_config(config):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return simulate(**config)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nodes', type=int, nargs='+', default=[4, 8, 16])
+    parser.add_argument('--blocks', type=int, default=100, help='blocks produced network-wide')
+    parser.add_argument('--consensus', choices=('pow', 'poa'), default='pow')
+    parser.add_argument('--block-interval', type=float, default=2.0, help='mean seconds between blocks')
+    parser.add_argument('--degree', type=int, default=4, help='peers per node')
+    parser.add_argument('--latency', type=float, default=0.1, help='link latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.05, help='extra random latency per link in seconds')
+    parser.add_argument('--bandwidth', type=float, default=1e6, help='link bandwidth in bytes/s')
+    parser.add_argument('--validation-delay', type=float, default=0.01, help='block validation time per node')
+    parser.add_argument('--tx-count', type=int, default=100, help='transactions per block')
+    parser.add_argument('--tx-size', type=int, default=100, help='transaction size in bytes')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=1, help='run node counts in parallel (0 = all cores)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    configs = [dict(node_count=nodes, blocks=args.blocks, consensus=args.consensus,
+                    block_interval=args.block_interval, degree=args.degree, latency=args.latency,
+                    jitter=args.jitter, bandwidth=args.bandwidth, validation_delay=args.validation_delay,
+                    tx_count=args.tx_count, tx_size=args.tx_size, seed=args.seed)
+               for nodes in args.nodes]
+    if args.processes == 1:
+        rows = [run_config(config) for config in configs]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(args.processes or None) as executor:
+            rows = list(executor.map(run_config, configs))
+    print(json.dumps(rows, indent=2))
+
+if __name__ == '__main__':
+    sys.exit(main())
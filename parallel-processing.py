@@ -1,84 +1,14 @@
-import hashlib
-import time
-import random
+import functools
 import tkinter as tk
 from tkinter import ttk
 import threading
-
-def create_transaction_of_size(byte_size):
-    """Simulates a transaction with a predefined size in bytes."""
-    return ''.join(random.choices('01', k=byte_size * 8))  # Simulate byte_size in bits as a binary string.
-
-class Block:
-    def __init__(self, Height, Blocksize, BlockHeader, TxCount, Txs):
-        self.Height = Height
-        self.Blocksize = Blocksize
-        self.BlockHeader = BlockHeader
-        self.Txcount = TxCount
-        self.Txs = Txs
-
-class BlockHeader:
-    def __init__(self, version, prevBlockHash, merkleRoot, timestamp, bits):
-        self.version = version
-        self.prevBlockHash = prevBlockHash
-        self.merkleRoot = merkleRoot
-        self.timestamp = timestamp
-        self.bits = bits
-        self.nonce = 0
-        self.blockHash = self.create_hash()  # Directly generate the block hash for PoA
-
-    def create_hash(self):
-        return hashlib.sha256(
-            (str(self.version) + self.prevBlockHash + self.merkleRoot + str(self.timestamp) + self.bits).encode()
-        ).hexdigest()
-
-class Chain:
-    def __init__(self, chain_type, chain_id, validation_delay=0.1):
-        self.chain_type = chain_type
-        self.chain_id = chain_id
-        self.validation_delay = validation_delay
-        self.blockchain = []
-        self.block_times = []
-        self.GenesisBlock()
-
-    def GenesisBlock(self):
-        BlockHeight = 0
-        prevBlockHash = '0' * 64
-        self.addBlock(BlockHeight, prevBlockHash, 1)
-
-    def addBlock(self, BlockHeight, prevBlockHash, transaction_size):
-        """Adds a block instantly with PoA consensus."""
-        start_time = time.time()
-        time.sleep(self.validation_delay)  # Simulate validation delay
-        
-        timestamp = int(time.time())
-        transactions = [create_transaction_of_size(transaction_size) for _ in range(transaction_size)]
-        merkleRoot = self.create_merkle_root(transactions)
-        bits = 'ffff001f'
-        blockheader = BlockHeader(1, prevBlockHash, merkleRoot, timestamp, bits)  # No mining needed
-        
-        new_block = Block(BlockHeight, 1, blockheader.__dict__, len(transactions), transactions).__dict__
-        self.blockchain.append(new_block)
-        
-        end_time = time.time()
-        creation_time = end_time - start_time
-        self.block_times.append(creation_time)
-        
-        print(f"{self.chain_type} {self.chain_id} - Block {BlockHeight} created in {creation_time:.2f} seconds with PoA.")
-        return creation_time
-
-    def create_merkle_root(self, transactions):
-        """Creates a Merkle root from a list of transactions."""
-        transaction_hashes = [hashlib.sha256(tx.encode()).hexdigest() for tx in transactions]
-        while len(transaction_hashes) > 1:
-            if len(transaction_hashes) % 2 != 0:
-                transaction_hashes.append(transaction_hashes[-1])
-            transaction_hashes = [hashlib.sha256((transaction_hashes[i] + transaction_hashes[i + 1]).encode()).hexdigest()
-                                  for i in range(0, len(transaction_hashes), 2)]
-        return transaction_hashes[0]
-
-    def get_last_block(self):
-        return self.blockchain[-1] if self.blockchain else None
+from chainstore import ChainStore
+from gui_render import BoundedTable, FrameRenderer
+from merkle import sha256
+from multichain import Chain
+from scheduler import AsyncChainScheduler, ChainPlan
+from simclock import RealClock, VirtualClock
+from txstore import TxBodyStore
 
 class BlockchainApp(tk.Tk):
     def __init__(self, chains):
@@ -88,6 +18,11 @@ class BlockchainApp(tk.Tk):
         self.chains = chains
         self.create_widgets()
 
+        # The scheduler thread only posts events; rows are inserted by the Tk main loop
+        self.renderer = FrameRenderer(self, fps=10)
+        self.renderer.on_frame(self.table.flush)
+        self.renderer.start()
+
     def create_widgets(self):
         chain_frames = []
 
@@ -112,6 +47,14 @@ class BlockchainApp(tk.Tk):
             entry.insert(0, "100")
             setattr(chain, 'num_transactions_entry', entry)
 
+            # Transactions per Block
+            label = ttk.Label(frame, text="Transactions per Block:")
+            label.pack()
+            entry = ttk.Entry(frame)
+            entry.pack()
+            entry.insert(0, "100")
+            setattr(chain, 'tx_count_entry', entry)
+
             # Validation Delay
             label = ttk.Label(frame, text="Validation Delay (s):")
             label.pack()
@@ -122,6 +65,10 @@ class BlockchainApp(tk.Tk):
 
             chain_frames.append(frame)
 
+        # Virtual time skips validation delays instead of sleeping through them
+        self.virtual_time = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self, text="Virtual Time", variable=self.virtual_time).pack()
+
         # Start Mining Button
         self.start_mining_button = ttk.Button(self, text="Start Mining", command=self.start_mining)
         self.start_mining_button.pack(pady=10)
@@ -134,32 +81,34 @@ class BlockchainApp(tk.Tk):
         self.tree.heading('TPS', text='TPS')
         self.tree.heading('Bytes', text='Bytes per Block')
         self.tree.pack(fill=tk.BOTH, expand=True)
+        self.table = BoundedTable(self.tree, max_rows=500)
 
     def start_mining(self):
         # Start PoA "mining" for each chain with specified parameters
+        plans = []
         for chain in self.chains:
             num_blocks = int(chain.num_blocks_entry.get())
             transaction_size = int(chain.num_transactions_entry.get())
+            tx_count = int(chain.tx_count_entry.get())
             validation_delay = float(chain.validation_delay_entry.get())
             chain.validation_delay = validation_delay  # Update chain validation delay
+            chain.clock = VirtualClock(cpu_time=True) if self.virtual_time.get() else RealClock()
+            plans.append(ChainPlan(chain, num_blocks, transaction_size, tx_count))
 
-            # Start a separate thread for each chain
-            threading.Thread(target=self.mine_blocks_poa, args=(chain, num_blocks, transaction_size)).start()
+        # All chains run as coroutines on one event loop instead of one thread per chain
+        self.plans = {plan.chain: plan for plan in plans}
+        scheduler = AsyncChainScheduler(on_block=functools.partial(self.renderer.post, self.block_added))
+        threading.Thread(target=scheduler.run_sync, args=(plans,), daemon=True).start()
 
-    def mine_blocks_poa(self, chain, num_blocks, transactions_per_block):
-        """Creates blocks with PoA for the given chain."""
-        for i in range(num_blocks):
-            lastBlock = chain.get_last_block()
-            BlockHeight = lastBlock["Height"] + 1 if lastBlock else 0
-            prevBlockHash = lastBlock['BlockHeader']['blockHash'] if lastBlock else '0' * 64
-            creation_time = chain.addBlock(BlockHeight, prevBlockHash, transactions_per_block)
-            tps = transactions_per_block / creation_time if creation_time > 0 else 0
-            self.tree.insert('', 'end', values=(f"{chain.chain_type} {chain.chain_id}", BlockHeight, f"{creation_time:.2f}", f"{tps:.2f}", transactions_per_block))
+    def block_added(self, chain, BlockHeight, creation_time):
+        plan = self.plans[chain]
+        tps = plan.tx_count / creation_time if creation_time > 0 else 0
+        self.table.append((f"{chain.chain_type} {chain.chain_id}", BlockHeight, f"{creation_time:.2f}", f"{tps:.2f}", plan.transaction_size * plan.tx_count))
 
 if __name__ == "__main__":
-    # Initialize multiple chains with PoA consensus
-    chain1 = Chain("Chain", 1, validation_delay=0.1)
-    chain2 = Chain("Chain", 2, validation_delay=0.1)
+    # Initialize multiple chains with PoA consensus; blocks keep only tx hashes and a seed
+    chain1 = Chain("Chain", 1, validation_delay=0.1, store=ChainStore(TxBodyStore(sha256)))
+    chain2 = Chain("Chain", 2, validation_delay=0.1, store=ChainStore(TxBodyStore(sha256)))
 
     chains = [chain1, chain2]  # This can represent sharding, sidechains, or multichain architectures
     app = BlockchainApp(chains)
@@ -0,0 +1,229 @@
+"""Pipelined block production for the PoW, PoA and multichain simulations.
+
+Block production is split into stages that run in their own threads,
+joined by bounded queues:
+
+    tx-assembly -> merkle -> header -> validate-commit     (PoA, multichain)
+    tx-assembly -> merkle -> mine-commit                   (PoW)
+
+Transactions and Merkle roots do not depend on the previous block, so
+they are prepared ahead while earlier blocks are still being sealed or
+validated. Only the header stage follows the chain tip. PoW mines and
+commits in one stage because retargeting reads the committed chain.
+Throughput then approaches the slowest stage instead of the sum of all
+stages; the report shows each stage's utilization:
+
+    python pipeline.py --sim poa --blocks 100 --tx-count 500 --validation-delay 0.01 --compare
+"""
+import argparse
+import contextlib
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+import multichain
+import poa_chain
+import pow_chain
+from transactions import create_transactions
+
+QUEUE_SIZE = 4
+DONE = object()
+
+class Stage:
+    """One pipeline stage: a thread that applies fn to every item of its input queue."""
+    def __init__(self, name, fn):
+        self.name = name
+        self.fn = fn
+        self.items = 0
+        self.busy_ns = 0
+        self.error = None
+
+    def run(self, inbox, outbox):
+        while True:
+            item = inbox.get()
+            if item is DONE:
+                break
+            if self.error is not None:
+                continue  # Nach einem Fehler nur noch leeren, damit vorgelagerte Stufen nicht blockieren
+            start = time.perf_counter_ns()
+            try:
+                result = self.fn(item)
+            except Exception as exc:
+                self.error = exc
+                continue
+            self.busy_ns += time.perf_counter_ns() - start
+            self.items += 1
+            if outbox is not None:
+                outbox.put(result)
+        if outbox is not None:
+            outbox.put(DONE)
+
+class Pipeline:
+    """Runs items through stages connected by queues of at most queue_size items."""
+    def __init__(self, stages, queue_size=QUEUE_SIZE):
+        self.stages = stages
+        self.queue_size = queue_size
+
+    def run(self, items):
+        """Feeds items into the first stage and returns elapsed time and per-stage utilization."""
+        queues = [queue.Queue(self.queue_size) for _ in self.stages]
+        threads = [
+            threading.Thread(target=stage.run, args=(queues[i], queues[i + 1] if i + 1 < len(queues) else None),
+                             name=f"pipeline-{stage.name}", daemon=True)
+            for i, stage in enumerate(self.stages)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        count = 0
+        for item in items:
+            queues[0].put(item)
+            count += 1
+        queues[0].put(DONE)
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        for stage in self.stages:
+            if stage.error is not None:
+                raise stage.error
+        slowest = max(self.stages, key=lambda stage: stage.busy_ns)
+        return {
+            'items': count,
+            'elapsed_s': elapsed,
+            'items_per_s': count / elapsed if elapsed > 0 else 0.0,
+            # Obergrenze, wenn die langsamste Stufe ohne Pause arbeitet
+            'stage_bound_items_per_s': slowest.items / (slowest.busy_ns / 1e9) if slowest.busy_ns else 0.0,
+            'bottleneck': slowest.name,
+            'stages': {
+                stage.name: {
+                    'items': stage.items,
+                    'busy_s': stage.busy_ns / 1e9,
+                    'utilization': stage.busy_ns / 1e9 / elapsed if elapsed > 0 else 0.0,
+                }
+                for stage in self.stages
+            },
+        }
+
+def poa_stages(chain, transaction_size, tx_count):
+    """Stages for a PoA Blockchain or multichain Chain, continuing from its current tip."""
+    lastBlock = chain.get_last_block()
+    height = lastBlock["Height"] + 1 if lastBlock else 0
+    prevBlockHash = lastBlock['BlockHeader']['blockHash'] if lastBlock else '0' * 64
+
+    def assemble(_):
+        start_time = chain.clock.time()
+        with chain.tracer.span('tx-gen'):
+            return start_time, create_transactions(tx_count, transaction_size)
+
+    def merkle(item):
+        start_time, transactions = item
+        return start_time, transactions, chain.create_merkle_root(transactions)
+
+    def header(item):
+        nonlocal height, prevBlockHash
+        start_time, transactions, merkleRoot = item
+        block = chain.sealBlock(height, prevBlockHash, transactions, merkleRoot)
+        height, prevBlockHash = height + 1, block.BlockHeader.blockHash
+        return start_time, block
+
+    def validate_commit(item):
+        start_time, block = item
+        with chain.tracer.span('validation-wait'):
+            chain.clock.sleep(chain.validation_delay)
+        return chain.appendBlock(block, start_time)
+
+    return [Stage('tx-assembly', assemble), Stage('merkle', merkle), Stage('header', header),
+            Stage('validate-commit', validate_commit)]
+
+def pow_stages(blockchain, block_size):
+    """Stages for a PoW Blockchain that already has its genesis block."""
+    prev_hash = blockchain.chain[-1].header.block_hash
+
+    def assemble(_):
+        start_time = time.time()
+        with blockchain.tracer.span('tx-gen'):
+            return start_time, '0' * block_size
+
+    def merkle(item):
+        start_time, block_data = item
+        with blockchain.tracer.span('merkle'):
+            return start_time, pow_chain.hash256(block_data.encode()).hex()
+
+    def mine_commit(item):
+        nonlocal prev_hash
+        start_time, merkle_root = item
+        block_header = blockchain.mine_header(prev_hash, merkle_root)
+        prev_hash = block_header.block_hash
+        return blockchain.append_block(block_header, block_size, start_time)
+
+    return [Stage('tx-assembly', assemble), Stage('merkle', merkle), Stage('mine-commit', mine_commit)]
+
+def create_chain(args):
+    if args.sim == 'pow':
+        blockchain = pow_chain.Blockchain(difficulty=args.difficulty, workers=args.workers or None)
+        blockchain.create_genesis_block(block_size=args.block_size)
+        return blockchain
+    if args.sim == 'poa':
+        blockchain = poa_chain.Blockchain(validation_delay=args.validation_delay)
+        blockchain.create_genesis_block()
+        return blockchain
+    chain = multichain.Chain("Chain", 1, validation_delay=0)
+    chain.validation_delay = args.validation_delay
+    return chain
+
+def close_chain(chain):
+    if isinstance(chain, pow_chain.Blockchain):
+        chain.close()  # Mining-Prozesse beenden
+
+def create_stages(chain, args):
+    if args.sim == 'pow':
+        return pow_stages(chain, args.block_size)
+    return poa_stages(chain, args.tx_size, args.tx_count)
+
+def run_sequential(chain, args):
+    """Produces the same blocks one after another with add_block/addBlock, for comparison."""
+    started = time.perf_counter()
+    for _ in range(args.blocks):
+        if args.sim == 'pow':
+            chain.add_block(chain.chain[-1].header.block_hash, args.block_size)
+        else:
+            lastBlock = chain.get_last_block()
+            chain.addBlock(lastBlock["Height"] + 1, lastBlock['BlockHeader']['blockHash'], args.tx_size, args.tx_count)
+    elapsed = time.perf_counter() - started
+    return {'elapsed_s': elapsed, 'items_per_s': args.blocks / elapsed if elapsed > 0 else 0.0}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sim', choices=('pow', 'poa', 'multichain'), default='poa')
+    parser.add_argument('--blocks', type=int, default=50)
+    parser.add_argument('--tx-size', type=int, default=100, help='PoA transaction size in bytes')
+    parser.add_argument('--tx-count', type=int, default=100, help='PoA transactions per block')
+    parser.add_argument('--validation-delay', type=float, default=0.01, help='PoA validation delay in seconds')
+    parser.add_argument('--difficulty', type=float, default=3, help='PoW difficulty in leading hex zeros')
+    parser.add_argument('--workers', type=int, default=1, help='PoW mining processes (0 = all cores)')
+    parser.add_argument('--block-size', type=int, default=1024, help='PoW block size in bytes')
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE, help='items between two stages')
+    parser.add_argument('--compare', action='store_true', help='also run sequentially on a fresh chain')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = {}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        chain = create_chain(args)
+        report['pipelined'] = Pipeline(create_stages(chain, args), args.queue_size).run(range(args.blocks))
+        report['valid'] = chain.validate_chain(workers=1)['valid']
+        close_chain(chain)
+        if args.compare:
+            chain = create_chain(args)
+            report['sequential'] = run_sequential(chain, args)
+            close_chain(chain)
+    if args.compare:
+        report['speedup'] = report['sequential']['elapsed_s'] / report['pipelined']['elapsed_s']
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""Shared PoA chain model for poa_chain.Blockchain and multichain.Chain.
+
+Both chains seal blocks instantly and only differ in the hash function used
+for headers and Merkle trees and in the line printed per block. Subclasses
+set a BlockHeader subclass with its hash_function, a log_format and a
+module-level check_blocks, which validation can ship to a process pool.
+"""
+from chainstore import ChainStore
+from merkle import MerkleTree
+from metrics import StreamingMetrics, TimeSeries
+from simclock import RealClock
+from tracing import NULL_TRACER
+from transactions import GeneratedTransactions, create_transactions
+from validation import VALIDATION_CHUNK_SIZE, validate_chain
+
+class Block:
+    __slots__ = ('Height', 'Blocksize', 'BlockHeader', 'Txcount', 'Txs')
+
+    def __init__(self, Height, Blocksize, BlockHeader, TxCount, Txs):
+        self.Height = Height
+        self.Blocksize = Blocksize
+        self.BlockHeader = BlockHeader
+        self.Txcount = TxCount
+        self.Txs = Txs
+
+class BlockHeader:
+    __slots__ = ('version', 'prevBlockHash', 'merkleRoot', 'timestamp', 'bits', 'nonce', 'blockHash')
+    hash_function = None  # staticmethod, bytes -> digest, set by subclasses
+
+    def __init__(self, version, prevBlockHash, merkleRoot, timestamp, bits):
+        self.version = version
+        self.prevBlockHash = prevBlockHash
+        self.merkleRoot = merkleRoot
+        self.timestamp = timestamp
+        self.bits = bits
+        self.nonce = 0
+        self.blockHash = self.generate_block_hash()  # Generate hash immediately, no mining needed
+
+    def generate_block_hash(self):
+        """Simulate instant block hash generation for PoA"""
+        return self.hash_function((str(self.version) + self.prevBlockHash + self.merkleRoot + str(self.timestamp)
+                                   + self.bits).encode()).hex()
+
+class PoAChain:
+    header_class = BlockHeader  # Its hash_function also hashes the Merkle tree
+    check_blocks = None  # staticmethod around a module-level function, picklable for process pools
+    log_format = "Block {block.Height} added in {creation_time:.5f} seconds with {block.Txcount} transactions"
+
+    def __init__(self, validation_delay=0, merkle_executor=None, store=None, clock=None, tracer=None):
+        # Packed headers, read through dict-like views; pass a BlockFileStore to persist the chain
+        self.blockchain = store if store is not None else ChainStore()
+        self.block_times = TimeSeries()  # Compact array('d') with a running total
+        self.metrics = StreamingMetrics()  # O(1) per block: totals, rolling TPS, percentiles
+        self.checkpoint = None  # Last validated height, see validate_chain
+        self.validation_delay = validation_delay  # Delay in seconds
+        self.merkle_executor = merkle_executor  # Optional thread pool for hashing large Merkle levels
+        self.clock = clock if clock is not None else RealClock()  # VirtualClock skips the delays
+        self.tracer = tracer if tracer is not None else NULL_TRACER  # tracing.Tracer records per-phase spans
+
+    def set_validation_delay(self, delay):
+        """Allows setting the validation delay dynamically."""
+        self.validation_delay = delay
+
+    def create_genesis_block(self):
+        BlockHeight = 0
+        prevBlockHash = '0' * 64
+        self.addBlock(BlockHeight, prevBlockHash, 1)
+
+    def addBlock(self, BlockHeight, prevBlockHash, transaction_size, tx_count=None):
+        """Adds a block instantly with PoA consensus."""
+        start_time = self.clock.time()
+        if tx_count is None:
+            tx_count = transaction_size  # Legacy: size doubles as count
+        with self.tracer.span('tx-gen'):
+            transactions = create_transactions(tx_count, transaction_size)
+        return self.addBlockFromTransactions(BlockHeight, prevBlockHash, transactions, start_time=start_time)
+
+    def assembleBlock(self, transaction_size, tx_count=None):
+        """Generates transactions and their Merkle root without adding a block."""
+        if tx_count is None:
+            tx_count = transaction_size
+        with self.tracer.span('tx-gen'):
+            transactions = create_transactions(tx_count, transaction_size)
+        return transactions, self.create_merkle_root(transactions)
+
+    def addBlockFromTransactions(self, BlockHeight, prevBlockHash, transactions, merkleRoot=None, start_time=None):
+        """Adds a block for transactions assembled elsewhere, e.g. pulled from a mempool."""
+        if start_time is None:
+            start_time = self.clock.time()
+
+        # Apply validation delay before adding the block (for simulating network delay if needed)
+        with self.tracer.span('validation-wait'):
+            self.clock.sleep(self.validation_delay)
+
+        if merkleRoot is None:
+            merkleRoot = self.create_merkle_root(transactions)
+        return self.commitBlock(BlockHeight, prevBlockHash, transactions, merkleRoot, start_time)
+
+    def commitBlock(self, BlockHeight, prevBlockHash, transactions, merkleRoot, start_time):
+        """Appends an already validated block; timestamps come from self.clock."""
+        return self.appendBlock(self.sealBlock(BlockHeight, prevBlockHash, transactions, merkleRoot), start_time)
+
+    def sealBlock(self, BlockHeight, prevBlockHash, transactions, merkleRoot):
+        """Builds the block and its header hash without appending it."""
+        timestamp = int(self.clock.time())
+        bits = 'ffff001f'
+        with self.tracer.span('header-hash'):
+            blockheader = self.header_class(1, prevBlockHash, merkleRoot, timestamp, bits)  # Hash generated instantly
+        return Block(BlockHeight, 1, blockheader, len(transactions), transactions)
+
+    def appendBlock(self, new_block, start_time):
+        """Appends a sealed block and records its creation time since start_time."""
+        self.blockchain.append(new_block)
+
+        end_time = self.clock.time()
+        creation_time = end_time - start_time
+        self.block_times.append(creation_time)
+        self.metrics.record(creation_time, new_block.Txcount, end_time)
+
+        print(self.log_format.format(chain=self, block=new_block, creation_time=creation_time))
+        return creation_time
+
+    def create_merkle_root(self, transactions):
+        """Creates a Merkle root from a list of transactions."""
+        with self.tracer.span('merkle'):
+            tree = MerkleTree(transactions, self.header_class.hash_function, self.merkle_executor)
+        if isinstance(transactions, GeneratedTransactions):
+            transactions.keep_leaves(self.header_class.hash_function, tree.levels[0])
+        return tree.root_hex()
+
+    def get_last_block(self):
+        return self.blockchain[-1] if self.blockchain else None
+
+    def get_block(self, height):
+        return self.blockchain[height] if 0 <= height < len(self.blockchain) else None
+
+    def get_block_by_hash(self, block_hash):
+        return self.blockchain.find(block_hash)
+
+    def get_ancestors(self, block_hash):
+        """Walks prevBlockHash links from block_hash back to genesis."""
+        return self.blockchain.ancestors(block_hash)
+
+    def chain_length(self):
+        return len(self.blockchain)
+
+    def block_hash_at(self, height):
+        return self.blockchain[height]['BlockHeader']['blockHash']
+
+    def validation_items(self, start, stop):
+        """Returns the per-block tuples that check_blocks expects for heights [start, stop)."""
+        expectedPrev = self.block_hash_at(start - 1) if start > 0 else '0' * 64
+        items = []
+        for block in self.blockchain[start:stop]:
+            header = block['BlockHeader']
+            Txs = block['Txs']
+            # Pruned bodies: check the Merkle root against the stored transaction hashes instead
+            TxIds = block['TxIds'] if Txs is None else None
+            items.append((block['Height'], expectedPrev, header['version'], header['prevBlockHash'],
+                          header['merkleRoot'], header['timestamp'], header['bits'], header['blockHash'],
+                          None if Txs is None else list(Txs), TxIds))
+            expectedPrev = header['blockHash']
+        return items
+
+    def validate_chain(self, workers=None, chunk_size=VALIDATION_CHUNK_SIZE):
+        """Checks parent links, Merkle roots and header hashes of all blocks after the last checkpoint."""
+        return validate_chain(self, self.check_blocks, workers, chunk_size)
+
+def check_blocks(items, header_class):
+    """Recomputes header hashes and Merkle roots for a range of blocks; returns (height, problem) pairs."""
+    hash_function = header_class.hash_function
+    errors = []
+    for Height, expectedPrev, version, prevBlockHash, merkleRoot, timestamp, bits, blockHash, Txs, TxIds in items:
+        if prevBlockHash != expectedPrev:
+            errors.append((Height, 'prevBlockHash does not match parent'))
+        tree = MerkleTree(Txs, hash_function) if Txs is not None else MerkleTree.from_leaves(TxIds, hash_function)
+        if tree.root_hex() != merkleRoot:
+            errors.append((Height, 'merkleRoot does not match transactions'))
+        if header_class(version, prevBlockHash, merkleRoot, timestamp, bits).blockHash != blockHash:
+            errors.append((Height, 'blockHash does not match header'))
+    return errors
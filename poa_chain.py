@@ -0,0 +1,22 @@
+import psutil
+import poa_base
+from merkle import hash256
+from poa_base import Block
+
+class BlockHeader(poa_base.BlockHeader):
+    __slots__ = ()
+    hash_function = staticmethod(hash256)
+
+def check_blocks(items):
+    """Recomputes header hashes and Merkle roots for a range of blocks; returns (height, problem) pairs."""
+    return poa_base.check_blocks(items, BlockHeader)
+
+class Blockchain(poa_base.PoAChain):
+    header_class = BlockHeader
+    check_blocks = staticmethod(check_blocks)
+
+    def print_statistics(self):
+        if self.block_times:
+            print(f"Average block creation time: {self.block_times.mean():.5f} seconds")
+            print(f"CPU Usage: {psutil.cpu_percent()}%")
+            print(f"Memory Usage: {psutil.virtual_memory().percent}%")
@@ -0,0 +1,208 @@
+import hashlib
+import time
+from mining import (MAX_NONCE, NONCE, TELEMETRY_CHUNK_SIZE, MiningPool, MiningTelemetry, bits_to_target,
+                    difficulty_to_target, pack_header_prefix, resolve_workers, search_nonces, target_to_bits,
+                    target_to_difficulty)
+from metrics import StreamingMetrics, TimeSeries
+from tracing import NULL_TRACER
+from validation import VALIDATION_CHUNK_SIZE, validate_chain
+
+# Funktion für den SHA256-Hash
+def hash256(s):
+    return hashlib.sha256(hashlib.sha256(s).digest()).digest()
+
+# Block- und Blockheader-Klassen
+class Block:
+    __slots__ = ('height', 'header', 'block_size')
+
+    def __init__(self, height, header, block_size):
+        self.height = height
+        self.header = header
+        self.block_size = block_size  # Blockgröße in Bytes
+
+class BlockHeader:
+    __slots__ = ('version', 'prev_hash', 'merkle_root', 'timestamp', 'nonce', 'block_hash', 'difficulty', 'bits')
+
+    def __init__(self, prev_hash, merkle_root, timestamp, difficulty, version=1, bits=None):
+        self.version = version
+        self.prev_hash = prev_hash
+        self.merkle_root = merkle_root
+        self.timestamp = timestamp
+        self.nonce = 0
+        self.block_hash = ''
+        self.difficulty = difficulty
+        # Numerisches Target im kompakten Bitcoin-Format, erlaubt auch Bruchteile einer Hex-Null
+        self.bits = bits if bits is not None else target_to_bits(difficulty_to_target(difficulty))
+
+    def serialize_prefix(self):
+        """Returns the constant 76-byte header prefix that precedes the nonce."""
+        return pack_header_prefix(self.version, self.prev_hash, self.merkle_root, self.timestamp, self.bits)
+
+    def mine(self, pool=None, telemetry=None):
+        """Searches the nonce in this process, or across the processes of a mining.MiningPool."""
+        target = bits_to_target(self.bits)
+        if telemetry is None:
+            telemetry = MiningTelemetry()
+        telemetry.start_block(target)
+        while True:
+            prefix = self.serialize_prefix()
+            if pool is not None:
+                # Nonce-Raum auf die Prozesse des Pools verteilen
+                result = pool.mine(prefix, target, telemetry)
+            else:
+                result = self.search_nonces(prefix, target, telemetry)
+            if result:
+                self.nonce, self.block_hash = result
+                telemetry.finish_block()
+                return
+            # 32-Bit-Nonce-Raum erschöpft: Zeitstempel erhöhen und erneut suchen
+            self.timestamp += 1
+
+    def search_nonces(self, prefix, target, telemetry):
+        # Fortschritt nur pro Abschnitt an die Telemetrie melden, keine Ausgabe in der Schleife
+        for start in range(0, MAX_NONCE + 1, TELEMETRY_CHUNK_SIZE):
+            stop = min(start + TELEMETRY_CHUNK_SIZE, MAX_NONCE + 1)
+            result = search_nonces(prefix, target, start, stop)
+            if result:
+                telemetry.add(result[0] - start + 1)
+                return result
+            telemetry.add(stop - start)
+        return None
+
+# Blockchain-Klasse
+class Blockchain:
+    def __init__(self, difficulty=1, workers=1, tracer=None, retarget=None):
+        self.chain = []
+        self.block_times = TimeSeries()  # Kompaktes array('d') mit laufender Summe
+        self.metrics = StreamingMetrics()  # O(1) pro Block: Summen, gleitende Rate, Perzentile
+        self.hash_index = {}  # block_hash -> height
+        self.checkpoint = None  # Last validated height, see validate_chain
+        self.difficulty = difficulty
+        self.retarget = retarget  # z. B. retarget.EpochRetarget; None = feste Schwierigkeit
+        self.workers = workers  # 1 = single-threaded, None = ein Prozess pro CPU-Kern
+        self.mining_pool = None  # Langlebige Mining-Prozesse, beim ersten Block mit workers != 1 gestartet
+        self.tracer = tracer if tracer is not None else NULL_TRACER  # tracing.Tracer misst die einzelnen Phasen
+        self.telemetry = MiningTelemetry()  # Hashrate, ETA und Hashes pro Block, von außen abgefragt
+
+    def set_difficulty(self, difficulty):
+        self.difficulty = difficulty
+
+    def set_retarget(self, retarget):
+        self.retarget = retarget
+
+    def next_bits(self):
+        """Returns the compact target of the next block, from the retargeter once there is a chain."""
+        if self.retarget is None or not self.chain:
+            return target_to_bits(difficulty_to_target(self.difficulty))
+        bits = target_to_bits(self.retarget.next_target(self))
+        self.difficulty = target_to_difficulty(bits_to_target(bits))
+        return bits
+
+    def set_workers(self, workers):
+        self.workers = workers
+
+    def get_mining_pool(self):
+        """Returns the chain's MiningPool for self.workers, or None when mining in this process."""
+        if self.workers == 1:
+            return None
+        workers = resolve_workers(self.workers)
+        if self.mining_pool is None or self.mining_pool.workers != workers:
+            self.close()
+            self.mining_pool = MiningPool(workers)
+        return self.mining_pool
+
+    def close(self):
+        """Stops the mining processes; the next block starts a new pool if needed."""
+        if self.mining_pool is not None:
+            self.mining_pool.close()
+            self.mining_pool = None
+
+    def create_genesis_block(self, block_size):
+        self.add_block(prev_hash='0' * 64, block_size=block_size)
+
+    def add_block(self, prev_hash, block_size):
+        start_time = time.time()
+        # Simuliere Blockdaten mit fixer Größe
+        with self.tracer.span('tx-gen'):
+            block_data = '0' * block_size
+        with self.tracer.span('merkle'):
+            merkle_root = hash256(block_data.encode()).hex()
+        block_header = self.mine_header(prev_hash, merkle_root)
+        return self.append_block(block_header, block_size, start_time)
+
+    def mine_header(self, prev_hash, merkle_root):
+        """Builds the header for the next block and searches its nonce; does not append it."""
+        timestamp = int(time.time())
+        with self.tracer.span('header-hash'):
+            bits = self.next_bits()
+            block_header = BlockHeader(prev_hash, merkle_root, timestamp, self.difficulty, bits=bits)
+        with self.tracer.span('nonce-search'):
+            block_header.mine(self.get_mining_pool(), self.telemetry)
+        return block_header
+
+    def append_block(self, block_header, block_size, start_time):
+        """Appends a mined header as the next block and records its mining time since start_time."""
+        new_block = Block(len(self.chain), block_header, block_size)
+        self.chain.append(new_block)
+        self.hash_index[block_header.block_hash] = new_block.height
+
+        mining_time = time.time() - start_time
+        self.block_times.append(mining_time)
+        self.metrics.record(mining_time, 0)
+
+        print(f"Block {len(self.chain)-1} mined in {mining_time:.2f} seconds with block size {block_size} bytes")
+        return mining_time
+
+    def get_block(self, height):
+        return self.chain[height] if 0 <= height < len(self.chain) else None
+
+    def get_block_by_hash(self, block_hash):
+        height = self.hash_index.get(block_hash)
+        return None if height is None else self.chain[height]
+
+    def get_ancestors(self, block_hash):
+        """Walks prev_hash links from block_hash back to genesis."""
+        block = self.get_block_by_hash(block_hash)
+        while block is not None:
+            yield block
+            block = self.get_block_by_hash(block.header.prev_hash)
+
+    def chain_length(self):
+        return len(self.chain)
+
+    def block_hash_at(self, height):
+        return self.chain[height].header.block_hash
+
+    def validation_items(self, start, stop):
+        """Returns the per-block tuples that check_blocks expects for heights [start, stop)."""
+        expected_prev = self.block_hash_at(start - 1) if start > 0 else '0' * 64
+        items = []
+        for block in self.chain[start:stop]:
+            header = block.header
+            items.append((block.height, expected_prev, block.block_size, header.version, header.prev_hash,
+                          header.merkle_root, header.timestamp, header.bits, header.nonce, header.block_hash))
+            expected_prev = header.block_hash
+        return items
+
+    def validate_chain(self, workers=None, chunk_size=VALIDATION_CHUNK_SIZE):
+        """Checks parent links, Merkle roots and proof of work of all blocks after the last checkpoint."""
+        return validate_chain(self, check_blocks, workers, chunk_size)
+
+    def calculate_average_mining_time(self):
+        """Calculates the average mining time for all blocks."""
+        return self.block_times.mean()
+
+def check_blocks(items):
+    """Recomputes header hashes and checks them against their targets; returns (height, problem) pairs."""
+    errors = []
+    for height, expected_prev, block_size, version, prev_hash, merkle_root, timestamp, bits, nonce, block_hash in items:
+        if prev_hash != expected_prev:
+            errors.append((height, 'prev_hash does not match parent'))
+        if hash256(('0' * block_size).encode()).hex() != merkle_root:
+            errors.append((height, 'merkle_root does not match block data'))
+        header = pack_header_prefix(version, prev_hash, merkle_root, timestamp, bits) + NONCE.pack(nonce)
+        if hash256(header).hex() != block_hash:
+            errors.append((height, 'block_hash does not match header'))
+        elif int(block_hash, 16) > bits_to_target(bits):
+            errors.append((height, 'block_hash does not meet target'))
+    return errors
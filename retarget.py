@@ -0,0 +1,64 @@
+"""Difficulty retargeting for the PoW Blockchain.
+
+A retargeter computes the numeric target of the next block from the
+observed block_times and the targets of recent blocks. Whole hex digits of
+difficulty change the expected work in steps of 16x. The compact 'bits'
+target keeps a normalised mantissa of 16 to 23 significant bits, so one
+step changes the target by between about 1.2e-7 and 3e-5 of its value;
+at difficulty 4 the bits are 0x1f00ffff, a step of about 1.5e-5.
+
+EpochRetarget follows Bitcoin's rule: every window blocks, scale the target
+by actual/expected timespan, clamped to a factor of 4. LwmaRetarget
+adjusts every block from a linearly weighted moving average of recent
+block times, like the per-block DAAs of newer chains.
+"""
+from mining import MAX_TARGET, bits_to_target
+
+class EpochRetarget:
+    """Bitcoin-style retarget every window blocks, at most max_factor up or down per epoch."""
+    def __init__(self, target_block_time, window=2016, max_factor=4.0):
+        self.target_block_time = target_block_time
+        self.window = window
+        self.max_factor = max_factor
+
+    def next_target(self, blockchain):
+        prev_target = bits_to_target(blockchain.chain[-1].header.bits)
+        height = len(blockchain.chain)
+        if height < self.window or height % self.window:
+            return prev_target
+        # Nur am Epochenende über das Fenster summieren, im Mittel O(1) pro Block
+        actual = sum(blockchain.block_times[height - self.window:height])
+        expected = self.target_block_time * self.window
+        actual = min(max(actual, expected / self.max_factor), expected * self.max_factor)
+        return clamp_target(prev_target * actual / expected)
+
+class LwmaRetarget:
+    """Per-block retarget from a linearly weighted moving average of the last window block times.
+
+    The next target is the mean target of the window scaled by the weighted
+    mean block time over target_block_time; newer blocks weigh more, and
+    single block times are clipped to max_solve_factor * target_block_time
+    so one slow block cannot swing the target on its own.
+    """
+    def __init__(self, target_block_time, window=45, max_solve_factor=6.0):
+        self.target_block_time = target_block_time
+        self.window = window
+        self.max_solve_factor = max_solve_factor
+
+    def next_target(self, blockchain):
+        count = min(self.window, len(blockchain.chain))
+        blocks = blockchain.chain[-count:]
+        times = blockchain.block_times[len(blockchain.block_times) - count:]
+        limit = self.target_block_time * self.max_solve_factor
+        weighted = sum(weight * min(solve_time, limit) for weight, solve_time in enumerate(times, 1))
+        weighted_mean = weighted / (count * (count + 1) / 2)
+        mean_target = sum(bits_to_target(block.header.bits) for block in blocks) / count
+        return clamp_target(mean_target * max(weighted_mean, 1e-9) / self.target_block_time)
+
+RETARGETERS = {
+    'epoch': EpochRetarget,
+    'lwma': LwmaRetarget,
+}
+
+def clamp_target(target):
+    return max(1, min(MAX_TARGET, int(target)))
@@ -0,0 +1,135 @@
+"""Asyncio scheduler that runs many multichain Chains in one thread.
+
+Each chain's block production is a coroutine; transaction generation and
+Merkle hashing run on a shared executor and validation delays are
+asyncio.sleep calls, so thousands of chains need no thread per chain:
+
+    python scheduler.py --chains 1000 --blocks 10 --tx-size 100 --tx-count 50
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+
+from multichain import Chain, assemble_block
+from simclock import RealClock
+
+class ChainPlan:
+    """How many blocks of which shape one chain should produce."""
+    __slots__ = ('chain', 'num_blocks', 'transaction_size', 'tx_count')
+
+    def __init__(self, chain, num_blocks, transaction_size, tx_count=None):
+        self.chain = chain
+        self.num_blocks = num_blocks
+        self.transaction_size = transaction_size
+        self.tx_count = tx_count if tx_count is not None else transaction_size
+
+class AsyncChainScheduler:
+    """Runs the block production of many chains as coroutines on one event loop.
+
+    executor defaults to a shared ThreadPoolExecutor; a ProcessPoolExecutor
+    also works because assemble_block is a module-level function.
+    on_block(chain, BlockHeight, creation_time) is called after every block.
+    """
+    def __init__(self, executor=None, on_block=None):
+        self.executor = executor
+        self.on_block = on_block
+
+    async def run_chain(self, plan, executor):
+        loop = asyncio.get_running_loop()
+        chain = plan.chain
+        started = time.perf_counter()
+        tx_total = 0
+        for _ in range(plan.num_blocks):
+            start_time = chain.clock.time()
+            transactions, merkleRoot = await loop.run_in_executor(
+                executor, functools.partial(assemble_block, plan.transaction_size, plan.tx_count))
+            if isinstance(chain.clock, RealClock):
+                await asyncio.sleep(chain.validation_delay)
+            else:
+                # Virtuelle Uhr: Verzögerung sofort verbuchen, anderen Chains trotzdem Vortritt lassen
+                chain.clock.sleep(chain.validation_delay)
+                await asyncio.sleep(0)
+            lastBlock = chain.get_last_block()
+            BlockHeight = lastBlock["Height"] + 1 if lastBlock else 0
+            prevBlockHash = lastBlock['BlockHeader']['blockHash'] if lastBlock else '0' * 64
+            creation_time = chain.commitBlock(BlockHeight, prevBlockHash, transactions, merkleRoot, start_time)
+            tx_total += len(transactions)
+            if self.on_block is not None:
+                self.on_block(chain, BlockHeight, creation_time)
+        elapsed = time.perf_counter() - started
+        return {
+            'chain': f"{chain.chain_type} {chain.chain_id}",
+            'blocks': plan.num_blocks,
+            'transactions': tx_total,
+            'elapsed_s': elapsed,
+            'blocks_per_s': plan.num_blocks / elapsed if elapsed > 0 else 0.0,
+            'tps': tx_total / elapsed if elapsed > 0 else 0.0,
+        }
+
+    async def run(self, plans):
+        """Runs all plans concurrently and returns per-chain and aggregate throughput."""
+        executor = self.executor or concurrent.futures.ThreadPoolExecutor()
+        started = time.perf_counter()
+        try:
+            per_chain = await asyncio.gather(*(self.run_chain(plan, executor) for plan in plans))
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+        elapsed = time.perf_counter() - started
+        blocks = sum(result['blocks'] for result in per_chain)
+        transactions = sum(result['transactions'] for result in per_chain)
+        return {
+            'chains': len(plans),
+            'blocks': blocks,
+            'transactions': transactions,
+            'elapsed_s': elapsed,
+            'blocks_per_s': blocks / elapsed if elapsed > 0 else 0.0,
+            'tps': transactions / elapsed if elapsed > 0 else 0.0,
+            'per_chain': per_chain,
+        }
+
+    def run_sync(self, plans):
+        return asyncio.run(self.run(plans))
+
+def create_chains(count, validation_delay, chain_type="Chain"):
+    """Creates count chains; genesis blocks are added without the validation delay."""
+    chains = []
+    for chain_id in range(1, count + 1):
+        chain = Chain(chain_type, chain_id, validation_delay=0)
+        chain.validation_delay = validation_delay
+        chains.append(chain)
+    return chains
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--chains', type=int, default=100)
+    parser.add_argument('--blocks', type=int, default=10, help='blocks per chain')
+    parser.add_argument('--tx-size', type=int, default=100, help='transaction size in bytes')
+    parser.add_argument('--tx-count', type=int, default=100, help='transactions per block')
+    parser.add_argument('--validation-delay', type=float, default=0.1, help='validation delay in seconds')
+    parser.add_argument('--processes', type=int, default=0,
+                        help='use a process pool of this size for hashing (0 = shared thread pool)')
+    parser.add_argument('--per-chain', action='store_true', help='include per-chain results')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    executor = concurrent.futures.ProcessPoolExecutor(args.processes) if args.processes else None
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        plans = [ChainPlan(chain, args.blocks, args.tx_size, args.tx_count)
+                 for chain in create_chains(args.chains, args.validation_delay)]
+        report = AsyncChainScheduler(executor).run_sync(plans)
+    if executor is not None:
+        executor.shutdown()
+    if not args.per_chain:
+        del report['per_chain']
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    sys.exit(main())
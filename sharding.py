@@ -0,0 +1,221 @@
+"""Sharded multichain mode with cross-shard transactions routed as receipts.
+
+Transactions are assigned to one of N multichain Chain shards by the hash
+of their sender account; every shard runs in its own process. A
+transaction whose receiver lives on another shard is committed on the
+sender's shard and then completed by a receipt that the receiver's shard
+includes after receipt_delay seconds. Shards keep producing receipt-only
+blocks until every receipt is included, so each run measures the same
+completed work. The runner sweeps shard counts and cross-shard ratios and
+reports aggregate TPS as JSON:
+
+    python sharding.py --shards 1 2 4 8 --cross-ratio 0 0.1 0.5 --blocks 50
+"""
+import argparse
+import contextlib
+import hashlib
+import heapq
+import json
+import multiprocessing
+import os
+import queue
+import random
+import struct
+import sys
+import time
+
+from multichain import Chain
+
+# Transaktion: kind, sender, receiver | Nutzdaten
+TX_HEADER = struct.Struct('<BQQ')
+TRANSFER = 0
+RECEIPT = 1
+ACCOUNTS_PER_SHARD = 1000
+# Wartezeit beim Abholen von Receipts nach den eigenen Blöcken und beim Einsammeln der Shard-Ergebnisse
+DRAIN_POLL_INTERVAL = 0.1
+RESULT_POLL_INTERVAL = 1.0
+
+def shard_of(account, shards):
+    """Maps an account id to its shard by hashing the account key."""
+    digest = hashlib.sha256(account.to_bytes(8, 'little')).digest()
+    return int.from_bytes(digest[:8], 'little') % shards
+
+def account_pools(shards, seed=0):
+    """Returns ACCOUNTS_PER_SHARD account ids per shard, the same in every process."""
+    pools = [[] for _ in range(shards)]
+    rng = random.Random(seed)
+    while min(len(pool) for pool in pools) < ACCOUNTS_PER_SHARD:
+        account = rng.getrandbits(63)
+        pool = pools[shard_of(account, shards)]
+        if len(pool) < ACCOUNTS_PER_SHARD:
+            pool.append(account)
+    return pools
+
+def run_shard(shard_id, shards, inboxes, results, num_blocks, tx_count, tx_size, cross_ratio,
+              receipt_delay, validation_delay, seed):
+    """Produces num_blocks blocks on one shard, then receipt-only blocks until every inbound receipt is included.
+
+    Once a shard has produced its num_blocks blocks it tells every other
+    shard how many receipts it sent there, so each shard knows when it has
+    seen all of them. The counters go to results.
+    """
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        chain = Chain("Shard", shard_id, validation_delay=0)
+        chain.validation_delay = validation_delay
+        pools = account_pools(shards)
+        local = pools[shard_id]
+        remote = [shard for shard in range(shards) if shard != shard_id]
+        rng = random.Random(seed * 1_000_003 + shard_id)
+        body = bytes(max(0, tx_size - TX_HEADER.size))
+        waiting = []  # Heap aus (ready_at, receipt) für eingegangene Receipts
+        sent_to = [0] * shards
+        intra = cross_sent = receipts_included = 0
+        produced = receipt_blocks = 0
+        expected = finished_peers = 0  # Angekündigte Receipts und Shards, die fertig produziert haben
+
+        def receive(message):
+            nonlocal expected, finished_peers
+            ready_at, payload = message
+            if ready_at is None:
+                expected += payload  # Abschlussmeldung: so viele Receipts hat die Shard an uns geschickt
+                finished_peers += 1
+            else:
+                heapq.heappush(waiting, message)
+
+        start = time.perf_counter()
+        while produced < num_blocks or finished_peers < len(remote) or receipts_included < expected:
+            while True:
+                try:
+                    receive(inboxes[shard_id].get_nowait())
+                except queue.Empty:
+                    break
+            now = time.time()
+            if produced >= num_blocks and not (waiting and waiting[0][0] <= now):
+                # Nur noch Receipts ausstehend: bis zum nächsten fälligen Receipt oder einer Meldung warten
+                timeout = waiting[0][0] - now if waiting else DRAIN_POLL_INTERVAL
+                with contextlib.suppress(queue.Empty):
+                    receive(inboxes[shard_id].get(timeout=min(timeout, DRAIN_POLL_INTERVAL)))
+                continue
+            transactions = []
+            while waiting and waiting[0][0] <= now:
+                transactions.append(heapq.heappop(waiting)[1])
+            receipts_included += len(transactions)
+
+            outgoing = []
+            for _ in range(tx_count if produced < num_blocks else 0):
+                sender = rng.choice(local)
+                if remote and rng.random() < cross_ratio:
+                    target = rng.choice(remote)
+                    receiver = rng.choice(pools[target])
+                    transactions.append(TX_HEADER.pack(TRANSFER, sender, receiver) + body)
+                    outgoing.append((target, TX_HEADER.pack(RECEIPT, sender, receiver) + body))
+                    cross_sent += 1
+                else:
+                    transactions.append(TX_HEADER.pack(TRANSFER, sender, rng.choice(local)) + body)
+                    intra += 1
+
+            lastBlock = chain.get_last_block()
+            chain.addBlockFromTransactions(lastBlock["Height"] + 1, lastBlock['BlockHeader']['blockHash'],
+                                           transactions)
+            if produced >= num_blocks:
+                receipt_blocks += 1
+                continue
+            produced += 1
+            # Receipts erst nach dem Commit auf der Quell-Shard verschicken
+            ready_at = time.time() + receipt_delay
+            for target, receipt in outgoing:
+                inboxes[target].put((ready_at, receipt))
+                sent_to[target] += 1
+            if produced == num_blocks:
+                for target in remote:
+                    inboxes[target].put((None, sent_to[target]))
+        elapsed = time.perf_counter() - start
+    results.put({
+        'shard': shard_id,
+        'blocks': num_blocks + receipt_blocks,
+        'receipt_blocks': receipt_blocks,
+        'intra_tx': intra,
+        'cross_tx_sent': cross_sent,
+        'receipts_included': receipts_included,
+        'receipts_waiting': len(waiting),
+        'elapsed_s': elapsed,
+    })
+
+def collect_results(processes, results):
+    """Returns one result per shard process; raises if a shard process dies before reporting."""
+    collected = []
+    while len(collected) < len(processes):
+        try:
+            collected.append(results.get(timeout=RESULT_POLL_INTERVAL))
+        except queue.Empty:
+            failed = [process for process in processes if process.exitcode not in (None, 0)]
+            if failed:
+                for process in processes:
+                    process.terminate()
+                raise RuntimeError(f"shard process {failed[0].name} exited with code {failed[0].exitcode}") from None
+    return collected
+
+def run_sharded(shards, cross_ratio, num_blocks, tx_count, tx_size, receipt_delay=0.05,
+                validation_delay=0.0, seed=0):
+    """Runs one configuration with one process per shard and returns aggregate throughput."""
+    ctx = multiprocessing.get_context()
+    inboxes = [ctx.Queue() for _ in range(shards)]
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=run_shard,
+                    args=(shard_id, shards, inboxes, results, num_blocks, tx_count, tx_size, cross_ratio,
+                          receipt_delay, validation_delay, seed),
+                    name=f"shard-{shard_id}")
+        for shard_id in range(shards)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    per_shard = sorted(collect_results(processes, results), key=lambda result: result['shard'])
+    elapsed = time.perf_counter() - started
+    # Nicht mehr abgeholte Nachrichten leeren, sonst warten die Prozesse beim Beenden auf ihre Queues
+    while any(process.is_alive() for process in processes):
+        for inbox in inboxes:
+            with contextlib.suppress(queue.Empty):
+                while True:
+                    inbox.get_nowait()
+        for process in processes:
+            process.join(timeout=0.01)
+    intra = sum(result['intra_tx'] for result in per_shard)
+    receipts = sum(result['receipts_included'] for result in per_shard)
+    cross_sent = sum(result['cross_tx_sent'] for result in per_shard)
+    return {
+        'shards': shards,
+        'cross_ratio': cross_ratio,
+        'blocks': sum(result['blocks'] for result in per_shard),
+        'receipt_blocks': sum(result['receipt_blocks'] for result in per_shard),
+        'intra_tx': intra,
+        'cross_tx_sent': cross_sent,
+        'cross_tx_completed': receipts,
+        'cross_tx_pending': cross_sent - receipts,
+        'elapsed_s': elapsed,
+        # Gemessen bis alle Receipts eingebunden sind, jede Cross-Shard-Transaktion zählt also einmal vollständig
+        'tps': (intra + receipts) / elapsed if elapsed > 0 else 0.0,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--cross-ratio', type=float, nargs='+', default=[0.0, 0.1, 0.5])
+    parser.add_argument('--blocks', type=int, default=20, help='blocks per shard')
+    parser.add_argument('--tx-count', type=int, default=200, help='new transactions per block')
+    parser.add_argument('--tx-size', type=int, default=100, help='transaction size in bytes')
+    parser.add_argument('--receipt-delay', type=float, default=0.05, help='cross-shard receipt delay in seconds')
+    parser.add_argument('--validation-delay', type=float, default=0.0, help='validation delay in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows = [run_sharded(shards, ratio, args.blocks, args.tx_count, args.tx_size, args.receipt_delay,
+                        args.validation_delay, args.seed)
+            for shards in args.shards for ratio in args.cross_ratio]
+    print(json.dumps(rows, indent=2))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import heapq
+import itertools
+import time
+
+class RealClock:
+    """Wall-clock time; sleep() really blocks."""
+    def time(self):
+        return time.time()
+
+    def sleep(self, delay):
+        time.sleep(delay)
+
+class VirtualClock:
+    """Simulated time that starts at start (default: now) and only moves when told to.
+
+    sleep() advances the clock instantly instead of blocking. With
+    cpu_time=True the real time spent between calls is added as well, so
+    block creation times still include the actual hashing and Merkle work.
+    """
+    def __init__(self, start=None, cpu_time=False):
+        self.start = time.time() if start is None else start
+        self.offset = 0.0
+        self.cpu_time = cpu_time
+        self.origin = time.perf_counter()
+
+    def time(self):
+        now = self.start + self.offset
+        if self.cpu_time:
+            now += time.perf_counter() - self.origin
+        return now
+
+    def sleep(self, delay):
+        self.offset += delay
+
+    def advance_to(self, timestamp):
+        """Moves the clock forward to timestamp; never moves it backwards."""
+        if timestamp > self.time():
+            self.offset += timestamp - self.time()
+
+class Simulator:
+    """Discrete-event engine: callbacks run in order of their scheduled virtual time."""
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else VirtualClock()
+        self.events = []
+        self.sequence = itertools.count()  # Stabile Reihenfolge bei gleichen Zeitpunkten
+        self.processed = 0
+
+    def now(self):
+        return self.clock.time()
+
+    def schedule(self, delay, callback, *args):
+        """Runs callback(*args) delay virtual seconds from now."""
+        heapq.heappush(self.events, (self.now() + delay, next(self.sequence), callback, args))
+
+    def run(self, until=None, max_events=None):
+        """Processes events until the queue is empty, until is reached or max_events ran."""
+        while self.events and (max_events is None or self.processed < max_events):
+            timestamp, _, callback, args = self.events[0]
+            if until is not None and timestamp > until:
+                self.clock.advance_to(until)
+                break
+            heapq.heappop(self.events)
+            self.clock.advance_to(timestamp)
+            callback(*args)
+            self.processed += 1
+        return self.now()
+
+class BlockProducer:
+    """Produces PoA blocks on a Blockchain or Chain as scheduled events instead of sleeps.
+
+    Each block is assembled, then committed after validation_delay plus
+    network_delay, and the next block starts block_interval later. The chain
+    should use the simulator's clock so timestamps and creation times are
+    virtual.
+    """
+    def __init__(self, simulator, chain, num_blocks, tx_size, tx_count=None, block_interval=0.0,
+                 network_delay=0.0, on_block=None):
+        self.simulator = simulator
+        self.chain = chain
+        self.remaining = num_blocks
+        self.tx_size = tx_size
+        self.tx_count = tx_count if tx_count is not None else tx_size
+        self.block_interval = block_interval
+        self.network_delay = network_delay
+        self.on_block = on_block  # Optionaler Callback(BlockHeight, creation_time)
+
+    def start(self, delay=0.0):
+        self.simulator.schedule(delay, self.produce)
+
+    def produce(self):
+        if self.remaining <= 0:
+            return
+        self.remaining -= 1
+        start_time = self.simulator.now()
+        transactions, merkleRoot = self.chain.assembleBlock(self.tx_size, self.tx_count)
+        delay = self.chain.validation_delay + self.network_delay
+        self.simulator.schedule(delay, self.commit, transactions, merkleRoot, start_time)
+
+    def commit(self, transactions, merkleRoot, start_time):
+        lastBlock = self.chain.get_last_block()
+        BlockHeight = lastBlock["Height"] + 1 if lastBlock else 0
+        prevBlockHash = lastBlock['BlockHeader']['blockHash'] if lastBlock else '0' * 64
+        creation_time = self.chain.commitBlock(BlockHeight, prevBlockHash, transactions, merkleRoot, start_time)
+        if self.on_block is not None:
+            self.on_block(BlockHeight, creation_time)
+        self.simulator.schedule(self.block_interval, self.produce)
@@ -0,0 +1,177 @@
+"""Parallel parameter sweep over the PoW, PoA and multichain simulations.
+
+Every point of the parameter grid is run repeats times. Each run executes
+in its own worker process with its own seed, using the benchmark's
+setup/produce functions. Rows are appended to a CSV file as soon as a run
+finishes, so an interrupted sweep can continue with --resume:
+
+    python sweep.py --sim pow --grid difficulty=2,3,4 block_size=512,4096 --repeats 5 --output pow.csv
+    python sweep.py --sim poa multichain --grid tx_size=100,1000 validation_delay=0,0.05 --output poa.csv
+
+Grid keys are the benchmark.py option names (difficulty, block_size,
+tx_size, tx_count, validation_delay, workers, target_block_time, ...).
+"""
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+import benchmark
+import transactions
+from transactions import TransactionPool
+
+RESULT_COLUMNS = ('elapsed_s', 'blocks_per_s', 'tx_per_s', 'hashes_per_s', 'block_time_mean',
+                  'block_time_p50', 'block_time_p95', 'block_time_p99', 'error')
+
+def parse_value(text):
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+def parse_grid(specs, defaults):
+    """Turns ['difficulty=1,2', 'block_size=512'] into {'difficulty': [1, 2], 'block_size': [512]}."""
+    grid = {}
+    for spec in specs:
+        key, _, values = spec.partition('=')
+        key = key.strip().replace('-', '_')
+        if not hasattr(defaults, key) or not values:
+            raise SystemExit(f"invalid grid entry {spec!r}: expected <benchmark option>=<v1>,<v2>,...")
+        grid[key] = [parse_value(value) for value in values.split(',')]
+    return grid
+
+def make_run_id(sim, params, repeat, blocks, seed):
+    """Stable id of one run from its configuration, independent of its position in the plan."""
+    key = json.dumps([sim, params, repeat, blocks, seed], sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+def plan_runs(sims, grid, repeats, blocks, seed):
+    """Returns one run dict per simulation, grid point and repeat, in a deterministic order."""
+    keys = list(grid)
+    runs = []
+    for sim in sims:
+        for values in itertools.product(*(grid[key] for key in keys)):
+            params = dict(zip(keys, values))
+            for repeat in range(repeats):
+                # Id und Seed hängen nur von der Konfiguration ab, nicht von der Position im Plan
+                run_id = make_run_id(sim, params, repeat, blocks, seed)
+                runs.append({
+                    'run_id': run_id,
+                    'sim': sim,
+                    'repeat': repeat,
+                    'seed': int(run_id[:8], 16),
+                    'blocks': blocks,
+                    'params': params,
+                })
+    return runs
+
+def run_point(run):
+    """Runs one sweep point in the current (fresh) worker process and returns its CSV row."""
+    args = benchmark.parse_args([])
+    for key, value in run['params'].items():
+        setattr(args, key, value)
+    args.blocks = run['blocks']
+    args.workers = args.workers or None
+    # Eigener Seed pro Lauf: Transaktionsdaten und Zufallszahlen sind reproduzierbar
+    random.seed(run['seed'])
+    transactions.default_pool = TransactionPool(seed=run['seed'])
+    row = {key: run[key] for key in ('run_id', 'sim', 'repeat', 'seed', 'blocks')}
+    row.update(run['params'])
+    try:
+        trial = benchmark.run_trial(run['sim'], args)
+    except Exception as exc:
+        # Ein fehlgeschlagener Punkt soll die restliche Sweep-Nacht nicht abbrechen
+        row['error'] = repr(exc)
+        return row
+    block_times = trial['block_times']
+    row.update({
+        'elapsed_s': trial['elapsed_s'],
+        'blocks_per_s': trial['blocks_per_s'],
+        'tx_per_s': trial['tx_per_s'],
+        'hashes_per_s': trial['hashes_per_s'],
+        'block_time_mean': sum(block_times) / len(block_times) if block_times else 0.0,
+        'block_time_p50': benchmark.percentile(block_times, 0.50),
+        'block_time_p95': benchmark.percentile(block_times, 0.95),
+        'block_time_p99': benchmark.percentile(block_times, 0.99),
+        'error': '',
+    })
+    return row
+
+def completed_runs(path, columns):
+    """Returns the run_ids of successful rows in an existing output file with the same columns.
+
+    Failed rows are removed from the file, so their runs are written again
+    instead of appearing twice.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is not None and reader.fieldnames != columns:
+            raise SystemExit(f"cannot resume {path}: its columns {reader.fieldnames} differ from this sweep's "
+                             f"{columns}; use another --output")
+        rows = list(reader)
+    succeeded = [row for row in rows if not row.get('error')]
+    if len(succeeded) < len(rows):
+        with open(path + '.tmp', 'w', newline='') as f:
+            writer = csv.DictWriter(f, columns)
+            writer.writeheader()
+            writer.writerows(succeeded)
+        os.replace(path + '.tmp', path)
+    return {row['run_id'] for row in succeeded}
+
+def sweep(runs, output, processes=None, resume=False):
+    """Runs all runs on a process pool and appends one CSV row per finished run; returns the row count."""
+    columns = ['run_id', 'sim', 'repeat', 'seed', 'blocks'] + sorted({key for run in runs for key in run['params']})
+    columns += RESULT_COLUMNS
+    done = completed_runs(output, columns) if resume else set()
+    pending = [run for run in runs if run['run_id'] not in done]
+    append = resume and os.path.exists(output) and os.path.getsize(output) > 0
+    written = 0
+    # max_tasks_per_child=1 (ab Python 3.11): jeder Lauf bekommt einen frischen Prozess ohne Zustand
+    # früherer Läufe; davor setzt run_point zumindest Seed und Transaktionspool pro Lauf neu
+    pool_options = {'max_tasks_per_child': 1} if sys.version_info >= (3, 11) else {}
+    with open(output, 'a' if append else 'w', newline='') as f, \
+            concurrent.futures.ProcessPoolExecutor(processes, **pool_options) as executor:
+        writer = csv.DictWriter(f, columns, extrasaction='ignore')
+        if not append:
+            writer.writeheader()
+        futures = [executor.submit(run_point, run) for run in pending]
+        for future in concurrent.futures.as_completed(futures):
+            writer.writerow(future.result())
+            f.flush()
+            written += 1
+            print(f"{written}/{len(pending)} runs done", file=sys.stderr)
+    return written
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sim', nargs='+', choices=benchmark.SIMULATIONS, default=['poa'])
+    parser.add_argument('--grid', nargs='+', default=[], metavar='KEY=V1,V2',
+                        help='benchmark option and the values to sweep')
+    parser.add_argument('--blocks', type=int, default=20, help='blocks per run')
+    parser.add_argument('--repeats', type=int, default=3, help='runs per grid point')
+    parser.add_argument('--seed', type=int, default=0, help='base seed; each run derives its own seed from it and its configuration')
+    parser.add_argument('--processes', type=int, default=0, help='worker processes (0 = all cores)')
+    parser.add_argument('--output', default='sweep.csv', help='CSV file for the results')
+    parser.add_argument('--resume', action='store_true', help='skip runs already in --output and append')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    grid = parse_grid(args.grid, benchmark.parse_args([]))
+    runs = plan_runs(args.sim, grid, args.repeats, args.blocks, args.seed)
+    started = time.perf_counter()
+    written = sweep(runs, args.output, args.processes or None, args.resume)
+    print(f"{written} runs in {time.perf_counter() - started:.1f} s -> {args.output}", file=sys.stderr)
+
+if __name__ == '__main__':
+    sys.exit(main())
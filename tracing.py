@@ -0,0 +1,159 @@
+"""Per-phase timing spans for block production, with optional profiling.
+
+Chains take a tracer and wrap each phase of a block in tracer.span(name).
+The default NULL_TRACER records nothing. A Tracer records perf_counter_ns
+spans and can also run cProfile and tracemalloc. Its spans can be
+exported as plain JSON or in the Chrome trace format (chrome://tracing,
+Perfetto).
+"""
+import cProfile
+import contextlib
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+PHASES = ('tx-gen', 'merkle', 'header-hash', 'nonce-search', 'validation-wait')
+
+def phase_order(name):
+    """Sort key that lists the known phases in production order, other spans after them."""
+    return (PHASES.index(name), name) if name in PHASES else (len(PHASES), name)
+
+class Span:
+    """Context manager that measures one phase and reports it to its tracer."""
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns() - self.start)
+
+class NullTracer:
+    """Tracer that records nothing; the default of every chain."""
+    enabled = False
+    _span = contextlib.nullcontext()
+
+    def span(self, name):
+        return self._span
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+NULL_TRACER = NullTracer()
+
+class Tracer:
+    """Records (name, start_ns, duration_ns, thread) spans and per-phase totals.
+
+    Only the first max_spans spans are kept for export; the totals count
+    every span. profile and trace_memory enable cProfile and tracemalloc
+    between start() and stop(); cProfile only sees the thread that calls
+    start().
+    """
+    enabled = True
+
+    def __init__(self, profile=False, trace_memory=False, max_spans=1_000_000):
+        self.max_spans = max_spans
+        self.spans = []
+        self.totals = {}  # name -> [count, total_ns]
+        self.lock = threading.Lock()
+        self.profiler = cProfile.Profile() if profile else None
+        self.trace_memory = trace_memory
+        self.memory_snapshot = None
+
+    def span(self, name):
+        return Span(self, name)
+
+    def record(self, name, start_ns, duration_ns):
+        with self.lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append((name, start_ns, duration_ns, threading.get_ident()))
+            total = self.totals.get(name)
+            if total is None:
+                self.totals[name] = [1, duration_ns]
+            else:
+                total[0] += 1
+                total[1] += duration_ns
+
+    def start(self):
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def stop(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.memory_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def summary(self):
+        """Returns count, total and mean milliseconds and the share of traced time per phase."""
+        with self.lock:
+            totals = {name: list(total) for name, total in self.totals.items()}
+        traced_ns = sum(total_ns for _, total_ns in totals.values())
+        return {
+            name: {
+                'count': count,
+                'total_ms': total_ns / 1e6,
+                'mean_ms': total_ns / count / 1e6,
+                'share': total_ns / traced_ns if traced_ns else 0.0,
+            }
+            for name, (count, total_ns) in sorted(totals.items(), key=lambda item: phase_order(item[0]))
+        }
+
+    def profile_stats(self, limit=20, sort='cumulative'):
+        """Returns the top functions of the cProfile run as text, or None without profiling."""
+        if self.profiler is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def memory_stats(self, limit=10):
+        """Returns the source lines with the most allocated memory, or None without tracemalloc."""
+        if self.memory_snapshot is None:
+            return None
+        return [str(stat) for stat in self.memory_snapshot.statistics('lineno')[:limit]]
+
+    def to_json(self):
+        return {
+            'summary': self.summary(),
+            'spans': [{'name': name, 'start_ns': start, 'duration_ns': duration, 'thread': thread}
+                      for name, start, duration, thread in self.spans],
+        }
+
+    def to_chrome_trace(self):
+        # Complete-Events ("ph": "X") mit Zeitangaben in Mikrosekunden
+        pid = os.getpid()
+        return {
+            'traceEvents': [{'name': name, 'ph': 'X', 'ts': start / 1000, 'dur': duration / 1000,
+                             'pid': pid, 'tid': thread}
+                            for name, start, duration, thread in self.spans],
+            'displayTimeUnit': 'ms',
+        }
+
+    def write(self, path, format='json'):
+        """Writes the spans to path as 'json' or 'chrome'."""
+        data = self.to_chrome_trace() if format == 'chrome' else self.to_json()
+        with open(path, 'w') as f:
+            json.dump(data, f)
@@ -0,0 +1,92 @@
+import random
+import threading
+
+# Standardgröße des vorab erzeugten Zufallspuffers (1 MiB)
+DEFAULT_POOL_SIZE = 1 << 20
+# Ungerade Schrittweite, damit aufeinanderfolgende Transaktionen an verschiedenen Offsets beginnen
+OFFSET_STRIDE = 4099
+
+class GeneratedTransactions(list):
+    """List of payloads from a TransactionPool that remembers how to regenerate itself.
+
+    seed is the pool offset of the first payload, or None if the payloads
+    came straight from the RNG and cannot be rebuilt. txids holds the packed
+    Merkle leaf hashes once the chain has built its tree over the payloads.
+    """
+    __slots__ = ('pool', 'seed', 'tx_size', 'txids', 'leaf_hash')
+
+    def __init__(self, payloads, pool, seed, tx_size):
+        super().__init__(payloads)
+        self.pool = pool
+        self.seed = seed
+        self.tx_size = tx_size
+        self.txids = None
+        self.leaf_hash = None
+
+    def keep_leaves(self, hash_function, leaves):
+        """Remembers the Merkle leaf hashes so a TxBodyStore does not hash the payloads again."""
+        self.txids = b''.join(leaves)
+        self.leaf_hash = hash_function
+
+    def __reduce__(self):
+        # In anderen Prozessen gibt es den Pool nicht: dort als normale Liste ankommen
+        return list, (list(self),)
+
+class TransactionPool:
+    """Hands out random bytes payloads as slices of one pre-generated buffer.
+
+    Memory stays bounded by pool_size no matter how many transactions are
+    generated; payloads larger than the pool are drawn directly from the RNG.
+    """
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, seed=None):
+        self.rng = random.Random(seed)
+        self.buffer = self.rng.randbytes(pool_size)
+        self.view = memoryview(self.buffer)
+        self.offset = 0
+        # Chains auf einem gemeinsamen Thread-Pool teilen sich den Pool: Offsets nur unter Lock vergeben
+        self.lock = threading.Lock()
+
+    def reserve(self, tx_count, tx_size):
+        """Reserves the offsets of tx_count payloads in one step and returns the first one."""
+        span = len(self.buffer) - tx_size
+        with self.lock:
+            seed = self.offset % (span + 1)
+            self.offset = seed + tx_count * OFFSET_STRIDE
+        return seed
+
+    def create_transaction(self, byte_size):
+        """Returns a payload of exactly byte_size bytes."""
+        if byte_size > len(self.buffer):
+            with self.lock:
+                return self.rng.randbytes(byte_size)
+        offset = self.reserve(1, byte_size)
+        return bytes(self.view[offset:offset + byte_size])
+
+    def create_transactions(self, tx_count, tx_size):
+        """Returns tx_count payloads of tx_size bytes each."""
+        if tx_size > len(self.buffer):
+            payloads = [self.create_transaction(tx_size) for _ in range(tx_count)]
+            return GeneratedTransactions(payloads, self, None, tx_size)
+        seed = self.reserve(tx_count, tx_size)
+        return GeneratedTransactions(self.transactions_at(seed, tx_count, tx_size), self, seed, tx_size)
+
+    def transactions_at(self, seed, tx_count, tx_size):
+        """Rebuilds the payloads create_transactions returned for seed without advancing the pool."""
+        span = len(self.buffer) - tx_size
+        payloads = []
+        offset = seed
+        for _ in range(tx_count):
+            offset %= span + 1
+            payloads.append(bytes(self.view[offset:offset + tx_size]))
+            offset += OFFSET_STRIDE
+        return payloads
+
+default_pool = TransactionPool()
+
+def create_transaction_of_size(byte_size):
+    """Simulates a transaction with a predefined size in bytes."""
+    return default_pool.create_transaction(byte_size)
+
+def create_transactions(tx_count, tx_size):
+    """Simulates tx_count transactions of tx_size bytes each."""
+    return default_pool.create_transactions(tx_count, tx_size)
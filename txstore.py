@@ -0,0 +1,95 @@
+"""Transaction body storage for ChainStore: lazy bodies, LRU cache and pruning.
+
+With a TxBodyStore a ChainStore keeps, per block, only the packed leaf
+hashes of its transactions. Blocks whose transactions came from a
+TransactionPool also keep the count and the pool seed, so their bodies
+can be rebuilt on demand. Rebuilt bodies are checked against the stored
+hashes and held in an LRU cache of cache_blocks blocks. Bodies that cannot be rebuilt (mempool, sharding)
+are kept until they are prune_depth blocks deep and then dropped, leaving
+only their hashes.
+"""
+import collections
+
+from merkle import hash256
+
+class LazyTxs:
+    """Transactions of one block as (pool, seed, count, size) plus their leaf hashes."""
+    __slots__ = ('pool', 'seed', 'count', 'tx_size', 'txids')
+
+    def __init__(self, pool, seed, count, tx_size, txids):
+        self.pool = pool
+        self.seed = seed
+        self.count = count
+        self.tx_size = tx_size
+        self.txids = txids
+
+    def build(self):
+        return self.pool.transactions_at(self.seed, self.count, self.tx_size)
+
+class StoredTxs:
+    """Transactions that cannot be rebuilt; body is None once pruned."""
+    __slots__ = ('body', 'txids')
+
+    def __init__(self, body, txids):
+        self.body = body
+        self.txids = txids
+
+class TxBodyStore:
+    """Decides what a ChainStore keeps per block for its transactions.
+
+    hash_function must be the chain's Merkle leaf hash so that blocks with
+    pruned bodies can still be checked against their Merkle root.
+    """
+    def __init__(self, hash_function=hash256, cache_blocks=64, prune_depth=None):
+        self.hash_function = hash_function
+        self.cache_blocks = cache_blocks
+        self.prune_depth = prune_depth  # None = Bodies nie verwerfen
+        self.cache = collections.OrderedDict()  # Blockindex -> nachgebaute Transaktionen
+
+    def keep(self, txs):
+        """Returns the entry a ChainStore stores instead of the transaction list."""
+        hash_function = self.hash_function
+        if getattr(txs, 'txids', None) is not None and txs.leaf_hash is hash_function:
+            txids = txs.txids  # Blätter des Merkle-Baums übernehmen statt erneut zu hashen
+        else:
+            txids = b''.join(hash_function(tx) for tx in txs)
+        if getattr(txs, 'seed', None) is not None:
+            return LazyTxs(txs.pool, txs.seed, len(txs), txs.tx_size, txids)
+        return StoredTxs(list(txs), txids)
+
+    def load(self, entries, index):
+        """Returns the bodies of block index, or None if they were pruned or cannot be rebuilt."""
+        entry = entries[index]
+        if isinstance(entry, StoredTxs):
+            return entry.body
+        txs = self.cache.get(index)
+        if txs is not None:
+            self.cache.move_to_end(index)
+            return txs
+        txs = entry.build()
+        if b''.join(self.hash_function(tx) for tx in txs) != entry.txids:
+            return None  # Nachgebaute Bodies passen nicht zu den Hashes: wie geprunt behandeln
+        self.cache[index] = txs
+        if len(self.cache) > self.cache_blocks:
+            self.cache.popitem(last=False)
+        return txs
+
+    def load_txids(self, entries, index):
+        txids = entries[index].txids
+        return [txids[i:i + 32] for i in range(0, len(txids), 32)]
+
+    def appended(self, entries):
+        """Drops the body that just became prune_depth blocks deep; called after each append."""
+        if self.prune_depth is None:
+            return
+        index = len(entries) - 1 - self.prune_depth
+        if index >= 0:
+            entry = entries[index]
+            if isinstance(entry, StoredTxs):
+                entry.body = None
+            self.cache.pop(index, None)
+
+    def truncated(self, length):
+        """Forgets cached bodies of blocks at position length and later."""
+        for index in [index for index in self.cache if index >= length]:
+            del self.cache[index]
@@ -0,0 +1,66 @@
+import concurrent.futures
+import time
+
+from mining import resolve_workers
+
+# Anzahl der Blöcke pro Prüfauftrag im Prozess-Pool
+VALIDATION_CHUNK_SIZE = 1000
+
+class Checkpoint:
+    """Last height up to which a chain has been fully validated."""
+    __slots__ = ('height', 'block_hash')
+
+    def __init__(self, height, block_hash):
+        self.height = height
+        self.block_hash = block_hash
+
+def validate_chain(chain, check_blocks, workers=None, chunk_size=VALIDATION_CHUNK_SIZE):
+    """Validates every block after chain.checkpoint and moves the checkpoint forward.
+
+    chain provides chain_length(), block_hash_at(height) and
+    validation_items(start, stop); check_blocks is a module-level function
+    that takes one list of items and returns (height, problem) pairs. Ranges
+    of chunk_size blocks are checked across a process pool; workers=1 checks
+    them in this process.
+    """
+    start_time = time.perf_counter()
+    length = chain.chain_length()
+    checkpoint = chain.checkpoint
+    start = 0
+    if (checkpoint is not None and checkpoint.height < length
+            and chain.block_hash_at(checkpoint.height) == checkpoint.block_hash):
+        start = checkpoint.height + 1
+    ranges = [(low, min(low + chunk_size, length)) for low in range(start, length, chunk_size)]
+
+    errors = []
+    if resolve_workers(workers) == 1 or len(ranges) <= 1:
+        for low, high in ranges:
+            errors.extend(check_blocks(chain.validation_items(low, high)))
+    else:
+        workers = resolve_workers(workers)
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            pending = set()
+            for low, high in ranges:
+                # Nur wenige Bereiche gleichzeitig im Speicher halten
+                if len(pending) >= 2 * workers:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        errors.extend(future.result())
+                pending.add(executor.submit(check_blocks, chain.validation_items(low, high)))
+            for future in concurrent.futures.as_completed(pending):
+                errors.extend(future.result())
+    errors.sort()
+
+    # Checkpoint bis direkt vor den ersten fehlerhaften Block vorschieben
+    verified = (errors[0][0] if errors else length) - 1
+    if verified >= start:
+        chain.checkpoint = Checkpoint(verified, chain.block_hash_at(verified))
+    elapsed = time.perf_counter() - start_time
+    return {
+        'valid': not errors,
+        'from_height': start,
+        'checked': length - start,
+        'errors': errors,
+        'elapsed_s': elapsed,
+        'blocks_per_s': (length - start) / elapsed if elapsed > 0 else 0.0,
+    }